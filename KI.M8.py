@@ -19,16 +19,43 @@
 import tkinter as tk
 from tkinter import ttk, messagebox, Toplevel, scrolledtext
 import threading
+import asyncio
+import functools
 import requests
-from bs4 import BeautifulSoup
+from requests.adapters import HTTPAdapter
+from bs4 import BeautifulSoup, SoupStrainer
+from bs4.builder import builder_registry
 from ddgs import DDGS
+from ddgs.exceptions import RatelimitException
 import time
 import random
+import re
+import json
 import sqlite3
+import queue
+import os
+import codecs
+import socket
+import sys
+import zlib
+import argparse
+import multiprocessing
+from collections import deque
+from concurrent.futures import Executor, Future, ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from urllib.parse import urlparse, urljoin, urldefrag
+from urllib.robotparser import RobotFileParser
+from html.parser import HTMLParser
 # NEU: Import der stabileren Übersetzer-Bibliothek
 from deep_translator import GoogleTranslator
 from thefuzz import process, fuzz
 
+# Optionaler, C-basierter HTML-Parser (pip install selectolax)
+try:
+    from selectolax.lexbor import LexborHTMLParser as SelectolaxParser
+except ImportError:
+    SelectolaxParser = None
+
 # --- GLOBALE KONSTANTEN UND LISTEN ---
 DB_NAME = "wissens_ki_cache.db"
 MAX_RETRIES = 2
@@ -37,6 +64,107 @@ MAX_LINES = 50
 SIMILARITY_CUTOFF = 50
 MIN_TEXT_LENGTH = 150
 TRANSLATION_BLOCK_SIZE = 4500
+CACHE_MAX_AGE_HOURS = 24 # Frische-Fenster für Cache-Treffer vor der Websuche (0 = deaktiviert)
+SESSION_POOL_HOSTS = 64 # Hosts mit eigenem Keep-Alive-Pool pro Route (mind. doppelte Whitelist-Größe, LRU in urllib3)
+SESSION_POOL_CONNECTIONS = 4 # Max. Keep-Alive-Verbindungen pro Host
+PARALLEL_CANDIDATE_FETCHES = 4 # Gleichzeitig geladene DDGS-Kandidaten (1 = sequenziell)
+WHITELIST_MAX_CONNECTIONS = 8 # Globales Limit gleichzeitiger Abrufe im Whitelist-Fallback
+MAX_CONNECTIONS_PER_HOST = 2 # Limit gleichzeitiger Abrufe pro Host (gilt für alle Abrufe)
+HOST_MIN_INTERVAL = 2.0 # Mindestabstand (s) zwischen zwei Anfragen an denselben Host
+HOST_INTERVAL_JITTER = 1.5 # Zufälliger Zuschlag (s) auf den Mindestabstand
+MAX_DOWNLOAD_BYTES = 2 * 1024 * 1024 # Byte-Budget pro Seite beim gestreamten Download
+STREAM_CHUNK_SIZE = 64 * 1024 # Blockgröße beim gestreamten Download
+TEXT_BUDGET_CHARS = MAX_CHARS * 4 # Download endet, sobald geschätzt genug Text vorliegt (0 = nur Byte-Budget)
+MAX_CONTENT_LENGTH = 20 * 1024 * 1024 # Größere Ressourcen (laut Content-Length) werden gar nicht erst geladen
+PREFLIGHT_HEAD_REQUEST = False # Optionale HEAD-Anfrage zur Prüfung von Typ und Größe vor dem GET
+ALLOWED_CONTENT_TYPES = ('text/html', 'application/xhtml+xml', 'text/plain')
+BINARY_URL_EXTENSIONS = ('.pdf', '.zip', '.gz', '.jpg', '.jpeg', '.png', '.gif', '.webp', '.svg', '.mp3', '.mp4', '.avi', '.exe', '.doc', '.docx', '.xls', '.xlsx', '.ppt', '.pptx')
+CIRCUIT_FAILURE_THRESHOLD = 3 # Fehler in Folge, nach denen ein Host gesperrt wird (Circuit offen)
+CIRCUIT_BASE_COOLDOWN = 120 # Erste Sperrzeit (s), verdoppelt sich bei jedem weiteren Fehler
+CIRCUIT_MAX_COOLDOWN = 24 * 3600 # Maximale Sperrzeit (s)
+# Negativ-Cache: Gültigkeit (s) eines fehlgeschlagenen URL-Abrufs je Fehlerklasse (nicht aufgeführte Klassen werden nicht gemerkt)
+NEGATIVE_CACHE_TTL = {
+    'http_403': 6 * 3600, 'http_404': 24 * 3600, 'http_410': 7 * 24 * 3600,
+    'typ': 7 * 24 * 3600, # Falscher Content-Type oder zu groß
+    'zu_kurz': 12 * 3600, # Weniger als MIN_TEXT_LENGTH Zeichen
+    'inhalt': 12 * 3600, # Weiterleitungs- oder Platzhalter-Text (INVALID_CONTENT_PHRASES)
+    'timeout': 600, 'verbindung': 600,
+}
+PROXY_PROBE_TARGET = "https://duckduckgo.com/" # Ziel-URL für die Hintergrund-Prüfung der Proxys
+PROXY_PROBE_INTERVAL = 300 # Abstand (s) zwischen zwei Prüfrunden
+PROXY_PROBE_TIMEOUT = 8 # Timeout (s) einer einzelnen Proxy-Prüfung
+PROXY_EVICT_AFTER_FAILURES = 3 # Fehler in Folge, nach denen ein Proxy aussortiert wird
+PROXY_LATENCY_BUCKETS = (0.25, 0.5, 1.0, 2.0, 4.0, 8.0) # Obergrenzen (s) der Latenz-Histogramm-Klassen
+PROXY_BLOCK_STATUS_CODES = (403, 429) # Über einen Proxy meist eine Sperre der Proxy-IP: zählt gegen den Proxy, nicht den Host
+DDGS_RATE_INITIAL = 0.2 # Start-Rate des DDGS-Limiters (Anfragen pro Sekunde)
+DDGS_RATE_MIN = 0.01 # Untergrenze nach wiederholten Blockaden (1 Anfrage pro 100 s)
+DDGS_RATE_MAX = 1.0 # Obergrenze bei anhaltendem Erfolg
+DDGS_RATE_INCREASE = 0.05 # Additive Erhöhung nach Erfolg (AIMD)
+DDGS_RATE_DECREASE = 0.5 # Multiplikative Senkung nach Rate-Limit/Blockade (AIMD)
+DDGS_BUCKET_CAPACITY = 2 # Max. angesparte Anfragen (Burst) im Token-Bucket
+PREWARM_ENABLED = True # Beim Start DNS und Keep-Alive-Verbindungen zu den meistgenutzten Whitelist-Hosts vorbereiten
+PREWARM_HOSTS = 8 # Anzahl der vorgewärmten Whitelist-Hosts
+PREWARM_PARALLEL = 4 # Gleichzeitige Verbindungsaufbauten beim Vorwärmen
+PREWARM_TIMEOUT = 5 # Timeout (s) einer Vorwärm-Anfrage
+PREWARM_SEARCH_HOSTS = ("duckduckgo.com", "html.duckduckgo.com") # Such-Endpunkte (nur DNS, DDGS nutzt einen eigenen HTTP-Client)
+RESOLVED_URL_MAX_AGE_DAYS = 30 # Gültigkeit der gemerkten Ziel-URLs weitergeleiteter Whitelist-Suchen
+# MediaWiki-API statt HTML-Suchseite für diese Whitelist-Einträge (API-Basis austauschbar, z.B. für einen lokalen Stub-Server)
+MEDIAWIKI_API_ENDPOINTS = {
+    "https://de.wikipedia.org/": "https://de.wikipedia.org/w/api.php",
+    "https://en.wikipedia.org/": "https://en.wikipedia.org/w/api.php",
+}
+# Lokale Suche im Sphinx-Suchindex (searchindex.js) statt der JavaScript-Suchseite dieser Whitelist-Einträge
+SPHINX_SEARCH_INDEXES = {
+    "https://docs.python.org/3/": "https://docs.python.org/3/searchindex.js",
+}
+SPHINX_INDEX_MAX_AGE_DAYS = 7 # Danach wird der gespeicherte Suchindex neu geladen
+SPHINX_MIN_WORD_SHARE = 0.6 # Anteil der Suchwörter, die eine Seite treffen muss, um als Treffer zu gelten
+SPHINX_MAX_DOC_SHARE = 0.2 # Terme in mehr als diesem Anteil der Seiten (z.B. 'python') zählen nicht als Suchwort
+SPHINX_MAX_SUFFIX = 4 # Stammsuche: höchstens so viele Endungszeichen abschneiden ('comprehensions' -> 'comprehens')
+SPHINX_MIN_STEM = 4 # Stammsuche: kürzester zulässiger Stamm ('lists' -> 'list')
+KORPUS_DB_NAME = "wissens_ki_korpus.db" # Vorab gecrawlter, komprimierter Whitelist-Korpus mit Volltextindex (FTS5)
+KORPUS_ENABLED = True # Lokalen Korpus vor der Websuche abfragen
+KORPUS_MAX_TREFFER = 3 # Anzahl der Korpus-Artikel, die in die Zusammenfassung eingehen
+KORPUS_MAX_PAGES_PER_HOST = 50 # Crawler: max. gespeicherte Seiten pro Whitelist-Eintrag
+# Frage- und Füllwörter, die bei der Korpus-Suche nicht als Pflichtbegriffe zählen
+KORPUS_STOPWOERTER = {
+    'was', 'ist', 'sind', 'wer', 'wie', 'wo', 'wann', 'warum', 'welche', 'welcher', 'welches', 'der', 'die', 'das',
+    'ein', 'eine', 'einen', 'und', 'oder', 'mit', 'von', 'für', 'den', 'dem', 'des', 'gibt', 'es', 'im', 'in',
+    'what', 'who', 'how', 'why', 'when', 'where', 'which', 'the', 'and', 'for', 'are', 'does', 'with',
+}
+OFFLINE_MODE = False # Strikter Offline-Modus: nur Cache und lokaler Korpus, keinerlei Netzwerkzugriff (Startoption --offline)
+PARSER_BACKEND = None # HTML-Parser für die Textextraktion: None = schnellstes installiertes Backend, sonst ein Name aus PARSER_PRIORITAET
+PARSER_PRIORITAET = ('selectolax', 'lxml', 'html.parser', 'html5lib') # Reihenfolge nach Geschwindigkeit
+PARTIAL_PARSE = True # bs4-Backends bauen nur Inhalts-Tags und auszuschließende Bereiche statt des ganzen DOM auf
+EXTRACTION_PROCESSES = os.cpu_count() or 1 # Worker-Prozesse für die HTML-Extraktion (0 = Extraktion im Abruf-Thread)
+EXTRACTION_PROCESS_MIN_BYTES = 64 * 1024 # Kleinere Seiten werden im Thread extrahiert (Prozesswechsel lohnt nicht)
+STREAMING_EXTRACTION = False # Text ereignisbasiert schon während des Downloads extrahieren (HTMLParser, konstanter Speicher)
+STREAMING_TEXT_LIMIT = MAX_CHARS + 2000 # Streaming-Extraktion endet, sobald so viele Zeichen Inhaltstext vorliegen
+CONTENT_TAGS = ['p', 'h1', 'h2', 'h3', 'li'] # Tags, deren Text extrahiert wird
+CONTAINER_TAGS = ['main', 'article'] # Fallback, wenn keine CONTENT_TAGS vorhanden sind
+EXCLUDED_TAGS = ["script", "style", "nav", "footer", "header", "aside", "form", "meta", "link"] # Werden samt Inhalt verworfen
+HTTP_CACHE_ENABLED = True # Persistenter HTTP-Cache mit ETag/Last-Modified-Revalidierung (Tabelle http_cache)
+HTTP_CACHE_MAX_AGE_DAYS = 30 # Ältere Einträge werden nicht mehr verwendet und beim Speichern entfernt
+HTTP_CACHE_MAX_BYTES = 100 * 1024 * 1024 # Obergrenze der gespeicherten Bodies; darüber fallen die ältesten Einträge weg
+TRANSLATION_PARALLEL = 4 # Gleichzeitige Übersetzungen im Whitelist-Vergleich
+IO_THREADS = 32 # Threads für blockierende Aufrufe (requests, DDGS, Übersetzung) der asyncio-Engine
+ABBRUCH_TEXT = "Suche wurde erfolgreich durch den Benutzer abgebrochen."
+CACHE_PRAEFIX = "[Aus dem Cache vom" # Kennzeichnet Cache-Treffer in der Ausgabe
+TEILERGEBNIS_PRAEFIX = "[INFO: Zeitbudget von" # Kennzeichnet Teilergebnisse nach Ablauf des Zeitbudgets
+# Ergebnisse mit diesen Anfängen werden nicht (auch nicht manuell) gespeichert: Fehler, Abbrüche,
+# Cache-Treffer (sonst Duplikat mit verschachteltem Präfix) und Teilergebnisse (werden bewusst nicht gecacht)
+NICHT_SPEICHERBAR_PRAEFIXE = ("Keine Online-Dokumente", "Suche wurde", "Suche durch", CACHE_PRAEFIX, TEILERGEBNIS_PRAEFIX)
+HEDGING_ENABLED = False # Langsame Abrufe nach adaptiver Schwelle zusätzlich über eine andere Route starten
+HEDGE_PERCENTILE = 0.9 # Perzentil der bisherigen Abrufdauern, ab dem abgesichert wird
+HEDGE_MIN_DELAY = 1.0 # Untergrenze (s) der Hedge-Schwelle
+HEDGE_DEFAULT_DELAY = 3.0 # Hedge-Schwelle (s), solange noch zu wenige Messwerte vorliegen
+HEDGE_BUDGET_PER_SEARCH = 4 # Max. Zusatzanfragen (Hedges) pro Suche
+SEARCH_DEADLINE_DEFAULT = 90 # Voreingestelltes Zeitbudget (s) einer Suche in der GUI (0 = unbegrenzt)
+DEADLINE_SHARE_DDGS = 0.4 # Anteil des Restbudgets für die DDGS-Versuche
+DEADLINE_SHARE_WHITELIST = 0.7 # Anteil des Restbudgets für den Whitelist-Abruf
+DEADLINE_SHARE_TRANSLATION = 0.9 # Anteil des Restbudgets für die Übersetzung (Rest: Zusammenfassung)
+DEADLINE_REQUEST_MIN = 2.0 # Kleinster HTTP-Timeout (s), auch wenn das Budget fast aufgebraucht ist
+ABBRUCH_POLL_INTERVAL = 0.05 # Prüfintervall (s) des Abbruch-Wächters, bestimmt die Abbruch-Latenz
 
 # Liste der Domains, die bekanntermaßen unstrukturierten Text liefern (Blacklist)
 UNRELIABLE_DOMAINS = [
@@ -94,6 +222,69 @@ def initialize_db():
                 timestamp DATETIME DEFAULT CURRENT_TIMESTAMP
             )
         """)
+        # Indizes für die Cache-Abfrage vor der Websuche
+        cursor.execute("CREATE INDEX IF NOT EXISTS idx_anfragen_cache_anfrage ON anfragen_cache (anfrage)")
+        cursor.execute("CREATE INDEX IF NOT EXISTS idx_anfragen_cache_timestamp ON anfragen_cache (timestamp)")
+        # Host-Zustand für den Circuit Breaker (Erfolgsquote, Fehlerklasse, Latenz, Sperrzeit)
+        cursor.execute("""
+            CREATE TABLE IF NOT EXISTS host_health (
+                host TEXT PRIMARY KEY,
+                erfolge INTEGER NOT NULL DEFAULT 0,
+                fehler INTEGER NOT NULL DEFAULT 0,
+                fehler_in_folge INTEGER NOT NULL DEFAULT 0,
+                fehlerklasse TEXT,
+                latenz_ms REAL,
+                gesperrt_bis REAL NOT NULL DEFAULT 0
+            )
+        """)
+        # Zustand des adaptiven DDGS-Rate-Limiters (überdauert Programmstarts)
+        cursor.execute("""
+            CREATE TABLE IF NOT EXISTS rate_limiter (
+                name TEXT PRIMARY KEY,
+                rate REAL NOT NULL,
+                tokens REAL NOT NULL,
+                aktualisiert REAL NOT NULL
+            )
+        """)
+        # Negativ-Cache für URLs, deren Abruf fehlgeschlagen ist (Fehlerklasse mit eigener Gültigkeit)
+        cursor.execute("""
+            CREATE TABLE IF NOT EXISTS url_negativ_cache (
+                url TEXT PRIMARY KEY,
+                fehlerklasse TEXT NOT NULL,
+                grund TEXT,
+                gueltig_bis REAL NOT NULL
+            )
+        """)
+        # Ziel-URLs weitergeleiteter Whitelist-Suchen pro (Site, normalisierte Anfrage)
+        cursor.execute("""
+            CREATE TABLE IF NOT EXISTS aufgeloeste_urls (
+                site TEXT NOT NULL,
+                anfrage TEXT NOT NULL,
+                ziel_url TEXT NOT NULL,
+                timestamp DATETIME DEFAULT CURRENT_TIMESTAMP,
+                PRIMARY KEY (site, anfrage)
+            )
+        """)
+        # Heruntergeladene Suchindizes (z.B. searchindex.js der Python-Dokumentation)
+        cursor.execute("""
+            CREATE TABLE IF NOT EXISTS suchindizes (
+                url TEXT PRIMARY KEY,
+                inhalt TEXT NOT NULL,
+                timestamp DATETIME DEFAULT CURRENT_TIMESTAMP
+            )
+        """)
+        # HTTP-Antwort-Cache für die bedingte Revalidierung (If-None-Match / If-Modified-Since)
+        cursor.execute("""
+            CREATE TABLE IF NOT EXISTS http_cache (
+                url TEXT PRIMARY KEY,
+                headers TEXT NOT NULL,
+                body BLOB NOT NULL,
+                encoding TEXT,
+                etag TEXT,
+                last_modified TEXT,
+                timestamp DATETIME DEFAULT CURRENT_TIMESTAMP
+            )
+        """)
         conn.commit()
         conn.close()
         return True
@@ -101,6 +292,35 @@ def initialize_db():
         print(f"Fehler beim Initialisieren der Datenbank: {e}")
         return False
 
+def initialize_korpus_db():
+    """
+    Erstellt die Korpus-Datenbank: komprimierte Artikeltexte und ein inhaltsloser FTS5-Index darüber.
+    Der Korpus ist optional: schlägt die Einrichtung fehl (z.B. SQLite ohne FTS5, gesperrte oder defekte Datei),
+    wird er nur deaktiviert (KORPUS_ENABLED = False).
+    """
+    global KORPUS_ENABLED
+    try:
+        conn = sqlite3.connect(KORPUS_DB_NAME)
+        cursor = conn.cursor()
+        cursor.execute("""
+            CREATE TABLE IF NOT EXISTS korpus (
+                id INTEGER PRIMARY KEY,
+                url TEXT UNIQUE NOT NULL,
+                titel TEXT,
+                text_zlib BLOB NOT NULL,
+                timestamp DATETIME DEFAULT CURRENT_TIMESTAMP
+            )
+        """)
+        # content='': der Index speichert nur Tokens, der Text liegt ausschließlich komprimiert in 'korpus'
+        cursor.execute("CREATE VIRTUAL TABLE IF NOT EXISTS korpus_index USING fts5(titel, text, content='', tokenize='unicode61 remove_diacritics 2')")
+        conn.commit()
+        conn.close()
+        return True
+    except Exception as e:
+        print(f"Fehler beim Initialisieren der Korpus-Datenbank: {e}. Lokaler Korpus deaktiviert.")
+        KORPUS_ENABLED = False
+        return False
+
 def save_to_db(anfrage, quelle_typ, ergebnis_text):
     """Speichert die Anfrage und das Ergebnis in die Datenbank."""
     try:
@@ -131,6 +351,44 @@ def load_all_cache_data():
         print(f"Fehler beim Laden der Cache-Daten: {e}")
         return []
 
+def normalize_query(anfrage):
+    """Normalisiert eine Anfrage für den Cache-Vergleich (Kleinschreibung, ohne Satzzeichen und Mehrfach-Leerzeichen)."""
+    return ' '.join(re.sub(r'[^\w\s]', ' ', anfrage.lower()).split())
+
+def get_cached_result(anfrage, max_age_hours=CACHE_MAX_AGE_HOURS):
+    """
+    Sucht einen frischen Cache-Eintrag für die Anfrage (exakt, dann normalisiert).
+    Gibt (ergebnis_text, timestamp) zurück oder None, wenn kein Treffer vorliegt.
+    """
+    if not max_age_hours or max_age_hours <= 0:
+        return None
+    try:
+        conn = sqlite3.connect(DB_NAME)
+        cursor = conn.cursor()
+        # SQLite speichert CURRENT_TIMESTAMP in UTC, datetime('now') ist ebenfalls UTC
+        frische_grenze = f"-{int(max_age_hours * 3600)} seconds"
+
+        # 1. Exakter Treffer (nutzt den Index auf 'anfrage')
+        cursor.execute("SELECT ergebnis_text, timestamp FROM anfragen_cache "
+                       "WHERE anfrage = ? AND timestamp >= datetime('now', ?) ORDER BY id DESC LIMIT 1",
+                       (anfrage, frische_grenze))
+        row = cursor.fetchone()
+
+        # 2. Normalisierter Treffer (z.B. andere Groß-/Kleinschreibung oder Satzzeichen)
+        if not row:
+            normalisiert = normalize_query(anfrage)
+            cursor.execute("SELECT anfrage, ergebnis_text, timestamp FROM anfragen_cache "
+                           "WHERE timestamp >= datetime('now', ?) ORDER BY id DESC", (frische_grenze,))
+            for cached_anfrage, ergebnis_text, timestamp in cursor:
+                if normalize_query(cached_anfrage) == normalisiert:
+                    row = (ergebnis_text, timestamp)
+                    break
+        conn.close()
+        return row
+    except Exception as e:
+        print(f"Fehler beim Abrufen des Cache-Eintrags: {e}")
+        return None
+
 def get_similar_cached_queries(anfrage):
     """Sucht im Cache nach Anfragen, die der aktuellen Anfrage ähnlich sind."""
     try:
@@ -151,9 +409,96 @@ def get_similar_cached_queries(anfrage):
         print(f"Fehler beim Abrufen ähnlicher Anfragen: {e}")
         return []
 
-def translate_to_german(text):
+def load_http_cache(url):
+    """Lädt die gespeicherte HTTP-Antwort einer URL (dict mit headers, body, encoding, etag, last_modified) oder None."""
+    try:
+        conn = sqlite3.connect(DB_NAME)
+        cursor = conn.cursor()
+        cursor.execute("SELECT headers, body, encoding, etag, last_modified FROM http_cache WHERE url = ? AND timestamp >= datetime('now', ?)",
+                       (url, f"-{HTTP_CACHE_MAX_AGE_DAYS * 86400} seconds"))
+        row = cursor.fetchone()
+        conn.close()
+        if not row:
+            return None
+        return {'headers': json.loads(row[0]), 'body': row[1], 'encoding': row[2], 'etag': row[3], 'last_modified': row[4]}
+    except Exception as e:
+        print(f"Fehler beim Laden aus dem HTTP-Cache: {e}")
+        return None
+
+def save_http_cache(url, response, body, encoding):
+    """Speichert eine HTTP-Antwort (Body und Zeichensatz), sofern sie einen Validator (ETag oder Last-Modified) mitliefert."""
+    etag = response.headers.get('ETag')
+    last_modified = response.headers.get('Last-Modified')
+    if not etag and not last_modified:
+        return False
+    try:
+        conn = sqlite3.connect(DB_NAME)
+        cursor = conn.cursor()
+        cursor.execute("INSERT OR REPLACE INTO http_cache (url, headers, body, encoding, etag, last_modified, timestamp) "
+                       "VALUES (?, ?, ?, ?, ?, ?, CURRENT_TIMESTAMP)",
+                       (url, json.dumps(dict(response.headers)), body, encoding, etag, last_modified))
+        _bereinige_http_cache(cursor)
+        conn.commit()
+        conn.close()
+        return True
+    except Exception as e:
+        print(f"Fehler beim Speichern in den HTTP-Cache: {e}")
+        return False
+
+def _bereinige_http_cache(cursor):
+    """Entfernt Einträge älter als HTTP_CACHE_MAX_AGE_DAYS und, über HTTP_CACHE_MAX_BYTES hinaus, die ältesten."""
+    cursor.execute("DELETE FROM http_cache WHERE timestamp < datetime('now', ?)", (f"-{HTTP_CACHE_MAX_AGE_DAYS * 86400} seconds",))
+    cursor.execute("SELECT url, length(body) FROM http_cache ORDER BY timestamp DESC, rowid DESC")
+    summe, veraltet = 0, []
+    for url, groesse in cursor.fetchall():
+        summe += groesse
+        if summe > HTTP_CACHE_MAX_BYTES:
+            veraltet.append((url,))
+    if veraltet:
+        cursor.executemany("DELETE FROM http_cache WHERE url = ?", veraltet)
+
+def load_resolved_url(site, anfrage, max_age_days=RESOLVED_URL_MAX_AGE_DAYS):
+    """Liefert die gespeicherte Ziel-URL der Whitelist-Suche von site für die (normalisierte) Anfrage oder None."""
+    try:
+        conn = sqlite3.connect(DB_NAME)
+        cursor = conn.cursor()
+        cursor.execute("SELECT ziel_url FROM aufgeloeste_urls WHERE site = ? AND anfrage = ? AND timestamp >= datetime('now', ?)",
+                       (site, normalize_query(anfrage), f"-{int(max_age_days * 86400)} seconds"))
+        row = cursor.fetchone()
+        conn.close()
+        return row[0] if row else None
+    except Exception as e:
+        print(f"Fehler beim Laden der aufgelösten URL: {e}")
+        return None
+
+def save_resolved_url(site, anfrage, ziel_url):
+    """Speichert die Ziel-URL nach allen Weiterleitungen; ziel_url=None entfernt einen veralteten Eintrag."""
+    try:
+        conn = sqlite3.connect(DB_NAME)
+        cursor = conn.cursor()
+        if ziel_url:
+            cursor.execute("INSERT OR REPLACE INTO aufgeloeste_urls (site, anfrage, ziel_url, timestamp) VALUES (?, ?, ?, CURRENT_TIMESTAMP)",
+                           (site, normalize_query(anfrage), ziel_url))
+        else:
+            cursor.execute("DELETE FROM aufgeloeste_urls WHERE site = ? AND anfrage = ?", (site, normalize_query(anfrage)))
+        conn.commit()
+        conn.close()
+        return True
+    except Exception as e:
+        print(f"Fehler beim Speichern der aufgelösten URL: {e}")
+        return False
+
+def _warte(sekunden, abbruch_flag=None):
+    """Unterbrechbare Pause: endet sofort, sobald abbruch_flag gesetzt wird. Gibt True bei Abbruch zurück."""
+    if abbruch_flag is None:
+        time.sleep(sekunden)
+        return False
+    return abbruch_flag.wait(sekunden)
+
+def translate_to_german(text, abbruch_flag=None):
     """
     Übersetzt den gegebenen Text ins Deutsche mithilfe von deep_translator.
+    Bei gesetztem abbruch_flag werden die restlichen Blöcke unübersetzt übernommen.
     """
     if not text:
         return ""
@@ -179,15 +524,18 @@ def translate_to_german(text):
     print(f"INFO: Starte robuste Übersetzung von {len(text_blocks)} Textblöcken...")
 
     for i, block in enumerate(text_blocks):
+        if abbruch_flag is not None and abbruch_flag.is_set():
+            translated_text.extend(text_blocks[i:])
+            break
         try:
             translation = translator.translate(block)
             translated_text.append(translation)
             if len(text_blocks) > 1:
-                time.sleep(random.uniform(0.5, 1.5))
+                _warte(random.uniform(0.5, 1.5), abbruch_flag)
         except Exception as e:
             print(f"[Übersetzungsfehler Block {i+1} - {type(e).__name__}: Verwende Originaltext.]")
             translated_text.append(block)
-            time.sleep(random.uniform(0.5, 1.0))
+            _warte(random.uniform(0.5, 1.0), abbruch_flag)
 
     final_translation = "".join(translated_text)
     if len(final_translation) > 0:
@@ -208,6 +556,8 @@ def summarize_multiple_sources(sources_data, anfrage):
         url = data['href']
 
         source_info += f"Quelle #{i+1}: **{title.replace('Whitelist: ', '')}**\nURL: {url}\n"
+        if data.get('gekuerzt'):
+            source_info += "Hinweis: Seite nur teilweise geladen (Download-Budget erreicht).\n"
 
         sentences = [s.strip() for s in translated_text.split('.') if s.strip()]
         relevant_sentences = []
@@ -251,12 +601,782 @@ def summarize_multiple_sources(sources_data, anfrage):
 
 ## 🔍 BACKEND-LOGIK (Web-Suche und Scraping)
 
-def get_text_from_url(url, current_proxy=None):
+# Session-Pool: proxy (Route) -> requests.Session; die Verbindungen pro Host verwaltet der Adapter
+_session_pool = {}
+_session_pool_lock = threading.Lock()
+
+def get_pooled_session(proxy=None):
+    """
+    Liefert die wiederverwendbare Session der Route (Proxy bzw. Direktverbindung), damit TCP- und TLS-Verbindungen
+    per Keep-Alive erhalten bleiben. Ihr Adapter hält Verbindungspools für bis zu SESSION_POOL_HOSTS Hosts
+    (mindestens die doppelte Whitelist-Größe), sodass ein kompletter Whitelist-Durchlauf in den Pool passt.
+    Sessions werden nie geschlossen, da sie von mehreren I/O-Threads gleichzeitig genutzt werden.
+    """
+    with _session_pool_lock:
+        session = _session_pool.get(proxy)
+        if session is None:
+            session = requests.Session()
+            # urllib3-Verbindungspools sind thread-sicher; pool_block=False erlaubt kurzfristige Zusatzverbindungen
+            adapter = HTTPAdapter(pool_connections=max(SESSION_POOL_HOSTS, 2 * len(RELIABLE_URL_WHITELIST)),
+                                  pool_maxsize=SESSION_POOL_CONNECTIONS)
+            session.mount('http://', adapter)
+            session.mount('https://', adapter)
+            _session_pool[proxy] = session
+        return session
+
+# Host-Limits: host -> Semaphore mit MAX_CONNECTIONS_PER_HOST Plätzen
+_host_semaphores = {}
+_host_semaphores_lock = threading.Lock()
+
+def get_host_semaphore(url):
+    """Liefert die Semaphore, die gleichzeitige Abrufe pro Host auf MAX_CONNECTIONS_PER_HOST begrenzt."""
+    host = urlparse(url).netloc.lower()
+    with _host_semaphores_lock:
+        if host not in _host_semaphores:
+            _host_semaphores[host] = threading.BoundedSemaphore(MAX_CONNECTIONS_PER_HOST)
+        return _host_semaphores[host]
+
+class HostPolitenessScheduler:
+    """
+    Merkt sich pro Host den nächsten erlaubten Zugriffszeitpunkt. Gewartet wird nur, wenn derselbe
+    Host gerade erst angefragt wurde; Anfragen an verschiedene Hosts gehen sofort hinaus.
+    """
+    def __init__(self, min_intervall=HOST_MIN_INTERVAL, jitter=HOST_INTERVAL_JITTER):
+        self.min_intervall = min_intervall
+        self.jitter = jitter
+        self._naechster_zugriff = {} # host -> time.monotonic()-Zeitpunkt
+        self._lock = threading.Lock()
+
+    def reserviere(self, url):
+        """Reserviert den nächsten freien Zugriffs-Slot des Hosts und gibt die nötige Wartezeit (s) zurück."""
+        host = urlparse(url).netloc.lower()
+        with self._lock:
+            jetzt = time.monotonic()
+            slot = max(jetzt, self._naechster_zugriff.get(host, 0.0))
+            self._naechster_zugriff[host] = slot + self.min_intervall + random.uniform(0, self.jitter)
+            return slot - jetzt
+
+    def warte(self, url, abbruch_flag=None):
+        """Wartet bis zum reservierten Slot; ein gesetztes abbruch_flag beendet die Wartezeit sofort."""
+        wartezeit = self.reserviere(url)
+        if wartezeit > 0:
+            _warte(wartezeit, abbruch_flag)
+        return wartezeit
+
+_host_scheduler = HostPolitenessScheduler()
+
+
+class HostHealthTracker:
+    """
+    Erfasst pro Host Erfolge, Fehler, letzte Fehlerklasse und Latenz (persistiert in der Tabelle host_health).
+    Nach CIRCUIT_FAILURE_THRESHOLD Fehlern in Folge wird der Host gesperrt; die Sperrzeit verdoppelt sich
+    mit jedem weiteren Fehler. Nach Ablauf ist ein Probeabruf erlaubt, ein Erfolg schließt den Circuit.
+    """
+    def __init__(self, db_name=DB_NAME):
+        self.db_name = db_name
+        self._hosts = None # host -> Zustand, wird beim ersten Zugriff aus der DB geladen
+        self._lock = threading.Lock()
+
+    def _lade(self):
+        if self._hosts is not None:
+            return
+        self._hosts = {}
+        try:
+            conn = sqlite3.connect(self.db_name)
+            cursor = conn.cursor()
+            cursor.execute("SELECT host, erfolge, fehler, fehler_in_folge, fehlerklasse, latenz_ms, gesperrt_bis FROM host_health")
+            for host, erfolge, fehler, fehler_in_folge, fehlerklasse, latenz_ms, gesperrt_bis in cursor.fetchall():
+                self._hosts[host] = {'erfolge': erfolge, 'fehler': fehler, 'fehler_in_folge': fehler_in_folge,
+                                     'fehlerklasse': fehlerklasse, 'latenz_ms': latenz_ms, 'gesperrt_bis': gesperrt_bis}
+            conn.close()
+        except Exception as e:
+            print(f"Fehler beim Laden des Host-Zustands: {e}")
+
+    def _speichere(self, host, zustand):
+        try:
+            conn = sqlite3.connect(self.db_name)
+            cursor = conn.cursor()
+            cursor.execute("INSERT OR REPLACE INTO host_health (host, erfolge, fehler, fehler_in_folge, fehlerklasse, latenz_ms, gesperrt_bis) "
+                           "VALUES (?, ?, ?, ?, ?, ?, ?)",
+                           (host, zustand['erfolge'], zustand['fehler'], zustand['fehler_in_folge'],
+                            zustand['fehlerklasse'], zustand['latenz_ms'], zustand['gesperrt_bis']))
+            conn.commit()
+            conn.close()
+        except Exception as e:
+            print(f"Fehler beim Speichern des Host-Zustands: {e}")
+
+    def ist_gesperrt(self, url):
+        """True, solange der Circuit des Hosts offen ist."""
+        host = urlparse(url).netloc.lower()
+        with self._lock:
+            self._lade()
+            zustand = self._hosts.get(host)
+            return zustand is not None and zustand['gesperrt_bis'] > time.time()
+
+    def meistgenutzte(self, urls, anzahl):
+        """Die anzahl URLs mit den meisten erfolgreichen Abrufen (gesperrte Hosts ausgenommen, sonst Listenreihenfolge)."""
+        with self._lock:
+            self._lade()
+            jetzt = time.time()
+            offen = [url for url in urls
+                     if self._hosts.get(urlparse(url).netloc.lower(), {}).get('gesperrt_bis', 0.0) <= jetzt]
+            offen.sort(key=lambda url: self._hosts.get(urlparse(url).netloc.lower(), {}).get('erfolge', 0), reverse=True)
+        return offen[:anzahl]
+
+    def registriere(self, url, fehlerklasse=None, latenz=None):
+        """Verbucht einen Abruf: fehlerklasse=None bedeutet Erfolg, latenz in Sekunden."""
+        host = urlparse(url).netloc.lower()
+        with self._lock:
+            self._lade()
+            zustand = self._hosts.setdefault(host, {'erfolge': 0, 'fehler': 0, 'fehler_in_folge': 0,
+                                                    'fehlerklasse': None, 'latenz_ms': None, 'gesperrt_bis': 0.0})
+            if latenz is not None:
+                # Gleitender Mittelwert der Latenz
+                latenz_ms = latenz * 1000
+                zustand['latenz_ms'] = latenz_ms if zustand['latenz_ms'] is None else 0.8 * zustand['latenz_ms'] + 0.2 * latenz_ms
+
+            if fehlerklasse is None:
+                zustand['erfolge'] += 1
+                zustand['fehler_in_folge'] = 0
+                zustand['gesperrt_bis'] = 0.0
+            else:
+                zustand['fehler'] += 1
+                zustand['fehler_in_folge'] += 1
+                zustand['fehlerklasse'] = fehlerklasse
+                if zustand['fehler_in_folge'] >= CIRCUIT_FAILURE_THRESHOLD:
+                    sperrzeit = min(CIRCUIT_BASE_COOLDOWN * 2 ** (zustand['fehler_in_folge'] - CIRCUIT_FAILURE_THRESHOLD), CIRCUIT_MAX_COOLDOWN)
+                    zustand['gesperrt_bis'] = time.time() + sperrzeit
+                    print(f"INFO: Circuit für {host} geöffnet ({fehlerklasse}, {zustand['fehler_in_folge']} Fehler in Folge). Sperre für {sperrzeit:.0f}s.")
+            zustand_kopie = dict(zustand)
+        self._speichere(host, zustand_kopie)
+
+host_health = HostHealthTracker()
+
+
+class UrlNegativCache:
+    """
+    Merkt sich fehlgeschlagene URLs mit Fehlerklasse und Grund (persistiert in der Tabelle url_negativ_cache),
+    damit sie bei weiteren DDGS-Versuchen und späteren Suchen nicht erneut geladen werden.
+    Die Gültigkeit hängt von der Fehlerklasse ab (NEGATIVE_CACHE_TTL).
+    """
+    def __init__(self, db_name=DB_NAME):
+        self.db_name = db_name
+        self._urls = None # url -> (fehlerklasse, grund, gueltig_bis), wird beim ersten Zugriff aus der DB geladen
+        self._lock = threading.Lock()
+
+    def _lade(self):
+        if self._urls is not None:
+            return
+        self._urls = {}
+        try:
+            conn = sqlite3.connect(self.db_name)
+            cursor = conn.cursor()
+            cursor.execute("DELETE FROM url_negativ_cache WHERE gueltig_bis <= ?", (time.time(),))
+            conn.commit()
+            cursor.execute("SELECT url, fehlerklasse, grund, gueltig_bis FROM url_negativ_cache")
+            for url, fehlerklasse, grund, gueltig_bis in cursor.fetchall():
+                self._urls[url] = (fehlerklasse, grund, gueltig_bis)
+            conn.close()
+        except Exception as e:
+            print(f"Fehler beim Laden des Negativ-Caches: {e}")
+
+    def pruefe(self, url):
+        """Gibt (fehlerklasse, grund) zurück, solange die URL als fehlgeschlagen gilt, sonst None."""
+        with self._lock:
+            self._lade()
+            eintrag = self._urls.get(url)
+            if eintrag is None:
+                return None
+            if eintrag[2] <= time.time():
+                del self._urls[url]
+                return None
+            return eintrag[0], eintrag[1]
+
+    def registriere(self, url, fehlerklasse, grund=None):
+        """Vermerkt einen Fehlschlag; Fehlerklassen ohne Eintrag in NEGATIVE_CACHE_TTL werden ignoriert."""
+        ttl = NEGATIVE_CACHE_TTL.get(fehlerklasse)
+        if not ttl:
+            return
+        gueltig_bis = time.time() + ttl
+        with self._lock:
+            self._lade()
+            self._urls[url] = (fehlerklasse, grund, gueltig_bis)
+        try:
+            conn = sqlite3.connect(self.db_name)
+            cursor = conn.cursor()
+            cursor.execute("INSERT OR REPLACE INTO url_negativ_cache (url, fehlerklasse, grund, gueltig_bis) VALUES (?, ?, ?, ?)",
+                           (url, fehlerklasse, grund, gueltig_bis))
+            conn.commit()
+            conn.close()
+        except Exception as e:
+            print(f"Fehler beim Speichern im Negativ-Cache: {e}")
+
+url_negativ_cache = UrlNegativCache()
+
+
+class ProxyManager:
+    """
+    Verwaltet PROXY_POOL mit Erfolgsquote und Latenz-Histogramm pro Eintrag (None = Direktverbindung).
+    Die Auswahl erfolgt per Thompson-Sampling (Erfolgswahrscheinlichkeit geteilt durch Median-Latenz),
+    sodass schnelle, zuverlässige Proxys bevorzugt und unbekannte weiterhin erkundet werden.
+    Proxys mit PROXY_EVICT_AFTER_FAILURES Fehlern in Folge werden aussortiert, bis eine Prüfung wieder gelingt.
+    """
+    def __init__(self, proxies=PROXY_POOL, probe_ziel=PROXY_PROBE_TARGET, probe_intervall=PROXY_PROBE_INTERVAL):
+        self.probe_ziel = probe_ziel
+        self.probe_intervall = probe_intervall
+        self._stats = {proxy: self._neue_statistik() for proxy in proxies}
+        self._aussortiert = set()
+        self._lock = threading.Lock()
+        self._probe_thread = None
+        self._stop_flag = threading.Event()
+
+    @staticmethod
+    def _neue_statistik():
+        return {'erfolge': 0, 'fehler': 0, 'fehler_in_folge': 0,
+                'histogramm': [0] * (len(PROXY_LATENCY_BUCKETS) + 1), 'latenzen': deque(maxlen=100)}
+
+    def registriere(self, proxy, erfolg, latenz=None):
+        """Verbucht das Ergebnis eines Zugriffs über proxy (latenz in Sekunden)."""
+        with self._lock:
+            stats = self._stats.setdefault(proxy, self._neue_statistik())
+            if latenz is not None:
+                klasse = next((i for i, grenze in enumerate(PROXY_LATENCY_BUCKETS) if latenz <= grenze), len(PROXY_LATENCY_BUCKETS))
+                stats['histogramm'][klasse] += 1
+                stats['latenzen'].append(latenz)
+            if erfolg:
+                stats['erfolge'] += 1
+                stats['fehler_in_folge'] = 0
+                self._aussortiert.discard(proxy)
+            else:
+                stats['fehler'] += 1
+                stats['fehler_in_folge'] += 1
+                # Die Direktverbindung wird nie aussortiert
+                if proxy is not None and stats['fehler_in_folge'] >= PROXY_EVICT_AFTER_FAILURES and proxy not in self._aussortiert:
+                    self._aussortiert.add(proxy)
+                    print(f"INFO: Proxy {proxy} nach {stats['fehler_in_folge']} Fehlern in Folge aussortiert.")
+
+    def _median_latenz(self, stats):
+        if not stats['latenzen']:
+            return 1.0 # Annahme für noch ungemessene Einträge
+        latenzen = sorted(stats['latenzen'])
+        return latenzen[len(latenzen) // 2]
+
+    def waehle(self, ausser=False):
+        """Wählt einen Proxy (oder None für die Direktverbindung) per Thompson-Sampling, optional ohne 'ausser'."""
+        with self._lock:
+            aktive = [p for p in self._stats if p not in self._aussortiert and p != ausser]
+            if not aktive:
+                return None
+            def score(proxy):
+                stats = self._stats[proxy]
+                return random.betavariate(stats['erfolge'] + 1, stats['fehler'] + 1) / max(self._median_latenz(stats), 0.05)
+            return max(aktive, key=score)
+
+    def aktive_routen(self):
+        """Alle nicht aussortierten Routen (Proxys und None für die Direktverbindung)."""
+        with self._lock:
+            return [p for p in self._stats if p not in self._aussortiert]
+
+    def probe(self, proxy):
+        """Prüft einen Proxy gegen probe_ziel und verbucht Erfolg und Latenz."""
+        proxies = {"http": proxy, "https": proxy} if proxy else None
+        startzeit = time.monotonic()
+        try:
+            response = requests.get(self.probe_ziel, headers={'User-Agent': random.choice(USER_AGENT_POOL)},
+                                    timeout=PROXY_PROBE_TIMEOUT, proxies=proxies, stream=True)
+            response.close()
+            self.registriere(proxy, response.status_code < 400, time.monotonic() - startzeit)
+        except requests.exceptions.RequestException:
+            self.registriere(proxy, False, time.monotonic() - startzeit)
+
+    def _probe_schleife(self):
+        while not self._stop_flag.is_set():
+            with self._lock:
+                alle_proxies = list(self._stats)
+            for proxy in alle_proxies: # auch aussortierte, damit sie nach Erholung zurückkehren
+                if self._stop_flag.is_set():
+                    return
+                self.probe(proxy)
+            self._stop_flag.wait(self.probe_intervall)
+
+    def starte_probing(self):
+        """Startet die Hintergrund-Prüfung (Daemon-Thread, blockiert nie den Aufrufer)."""
+        if self._probe_thread is None or not self._probe_thread.is_alive():
+            self._stop_flag.clear()
+            self._probe_thread = threading.Thread(target=self._probe_schleife, name="wissens_ki_proxy_probe", daemon=True)
+            self._probe_thread.start()
+
+    def stoppe_probing(self):
+        self._stop_flag.set()
+
+    def statistik(self):
+        """Liefert pro Proxy Erfolgsquote, Median-Latenz, Histogramm und Aussortiert-Status."""
+        with self._lock:
+            return {proxy: {'erfolgsquote': stats['erfolge'] / max(stats['erfolge'] + stats['fehler'], 1),
+                            'median_latenz': self._median_latenz(stats),
+                            'histogramm': list(stats['histogramm']),
+                            'aussortiert': proxy in self._aussortiert}
+                    for proxy, stats in self._stats.items()}
+
+proxy_manager = ProxyManager()
+
+
+class AdaptiveRateLimiter:
+    """
+    Token-Bucket mit AIMD-Regelung, geteilt über alle Threads und Suchen: Nach Erfolg steigt die Rate
+    additiv, nach Rate-Limit/Blockade sinkt sie multiplikativ. Rate und Füllstand werden in der Tabelle
+    rate_limiter gespeichert, sodass ein länger unbenutzter Bucket beim nächsten Start sofort voll ist.
+    """
+    def __init__(self, name, db_name=DB_NAME, kapazitaet=DDGS_BUCKET_CAPACITY):
+        self.name = name
+        self.db_name = db_name
+        self.kapazitaet = kapazitaet
+        self.rate = DDGS_RATE_INITIAL
+        self.tokens = float(kapazitaet)
+        self.aktualisiert = time.time() # Wanduhr statt monotonic, da der Zustand Programmstarts überdauert
+        self._geladen = False
+        self._lock = threading.Lock()
+
+    def _lade(self):
+        if self._geladen:
+            return
+        self._geladen = True
+        try:
+            conn = sqlite3.connect(self.db_name)
+            cursor = conn.cursor()
+            cursor.execute("SELECT rate, tokens, aktualisiert FROM rate_limiter WHERE name = ?", (self.name,))
+            row = cursor.fetchone()
+            conn.close()
+            if row:
+                self.rate, self.tokens, self.aktualisiert = row
+        except Exception as e:
+            print(f"Fehler beim Laden des Rate-Limiters: {e}")
+
+    def _speichere(self):
+        try:
+            conn = sqlite3.connect(self.db_name)
+            cursor = conn.cursor()
+            cursor.execute("INSERT OR REPLACE INTO rate_limiter (name, rate, tokens, aktualisiert) VALUES (?, ?, ?, ?)",
+                           (self.name, self.rate, self.tokens, self.aktualisiert))
+            conn.commit()
+            conn.close()
+        except Exception as e:
+            print(f"Fehler beim Speichern des Rate-Limiters: {e}")
+
+    def _auffuellen(self):
+        jetzt = time.time()
+        self.tokens = min(self.kapazitaet, self.tokens + max(0.0, jetzt - self.aktualisiert) * self.rate)
+        self.aktualisiert = jetzt
+
+    def reserviere(self):
+        """Entnimmt ein Token und gibt die Wartezeit (s) zurück, bis die Anfrage gesendet werden darf."""
+        with self._lock:
+            self._lade()
+            self._auffuellen()
+            self.tokens -= 1.0 # Negativer Füllstand = reservierte Token künftiger Anfragen
+            wartezeit = 0.0 if self.tokens >= 0 else -self.tokens / self.rate
+            self._speichere()
+            return wartezeit
+
+    def erfolg(self):
+        """Additive Erhöhung der Rate nach einer erfolgreichen Anfrage."""
+        with self._lock:
+            self._lade()
+            self.rate = min(DDGS_RATE_MAX, self.rate + DDGS_RATE_INCREASE)
+            self._speichere()
+
+    def blockiert(self):
+        """Multiplikative Senkung der Rate nach Rate-Limit oder Blockade; angesparte Token verfallen."""
+        with self._lock:
+            self._lade()
+            self._auffuellen()
+            self.rate = max(DDGS_RATE_MIN, self.rate * DDGS_RATE_DECREASE)
+            self.tokens = min(self.tokens, 0.0)
+            self._speichere()
+            print(f"INFO: DDGS-Rate gesenkt auf {self.rate:.3f} Anfragen/s.")
+
+ddgs_limiter = AdaptiveRateLimiter("ddgs")
+
+
+def _waerme_host_vor(base_url, proxy):
+    """Baut per HEAD-Anfrage eine Keep-Alive-Verbindung im Session-Pool der Route auf (DNS, TCP, TLS)."""
+    proxies = {"http": proxy, "https": proxy} if proxy else None
+    try:
+        session = get_pooled_session(proxy)
+        session.head(base_url, headers={'User-Agent': random.choice(USER_AGENT_POOL)},
+                     timeout=PREWARM_TIMEOUT, proxies=proxies, allow_redirects=False).close()
+        return True
+    except requests.exceptions.RequestException:
+        return False
+
+def _vorwaerm_worker(auftraege, erfolge):
+    """Arbeitet Vorwärm-Aufträge (Host, Route) ab, bis die Warteschlange leer ist."""
+    while True:
+        try:
+            host, proxy = auftraege.get_nowait()
+        except queue.Empty:
+            return
+        if _waerme_host_vor(host, proxy):
+            erfolge.append(host)
+
+def vorwaermen():
+    """
+    Löst die Such-Endpunkte auf und öffnet gepoolte Verbindungen zu den PREWARM_HOSTS meistgenutzten
+    Whitelist-Hosts, damit die erste Suche keinen DNS- und TLS-Aufbau mehr bezahlt.
+    """
+    startzeit = time.monotonic()
+    for host in PREWARM_SEARCH_HOSTS:
+        try:
+            socket.getaddrinfo(host, 443, type=socket.SOCK_STREAM)
+        except OSError:
+            pass
+    hosts = host_health.meistgenutzte(RELIABLE_URL_WHITELIST, PREWARM_HOSTS)
+    # Jede aktive Route vorwärmen: der spätere Abruf wählt seine Route unabhängig (Pool-Schlüssel ist die Route)
+    routen = proxy_manager.aktive_routen()
+    auftraege = queue.SimpleQueue()
+    for host in hosts:
+        for proxy in routen:
+            auftraege.put((host, proxy))
+    anzahl = len(hosts) * len(routen)
+    # Eigene Daemon-Threads (höchstens PREWARM_PARALLEL) statt des I/O-Pools: hängende Vorwärm-Anfragen über tote Proxys
+    # dürfen keine Threads belegen, die die erste Suche braucht, und ein Programmende nicht aufhalten
+    erfolge = []
+    worker = [threading.Thread(target=_vorwaerm_worker, args=(auftraege, erfolge), name=f"wissens_ki_prewarm_{i}", daemon=True)
+              for i in range(min(PREWARM_PARALLEL, anzahl))]
+    for thread in worker:
+        thread.start()
+    for thread in worker:
+        thread.join()
+    print(f"INFO: Vorwärmen abgeschlossen: {len(erfolge)}/{anzahl} Verbindungen ({len(hosts)} Whitelist-Hosts, "
+          f"{len(routen)} Routen) in {time.monotonic() - startzeit:.1f}s.")
+
+def starte_vorwaermen():
+    """Startet das Vorwärmen in einem Daemon-Thread (blockiert nie die Tk-Hauptschleife)."""
+    threading.Thread(target=vorwaermen, name="wissens_ki_prewarm", daemon=True).start()
+
+def _zeichensatz(response):
+    """Zeichensatz aus dem Content-Type-Header, sonst UTF-8."""
+    treffer = re.search(r'charset=["\']?([\w.:-]+)', response.headers.get('Content-Type', ''), re.IGNORECASE)
+    return treffer.group(1) if treffer else 'utf-8'
+
+def _dekodiere(body, encoding):
+    """Dekodiert den Body tolerant (unbekannte Zeichensätze fallen auf UTF-8 zurück)."""
+    try:
+        return body.decode(encoding or 'utf-8', errors='replace')
+    except LookupError:
+        return body.decode('utf-8', errors='replace')
+
+def _geschaetzte_textlaenge(html):
+    """Grobe Schätzung des sichtbaren Textes (ohne Skripte, Styles und Tags)."""
+    ohne_skripte = re.sub(r'<(script|style)\b.*?</\1\s*>', ' ', html, flags=re.IGNORECASE | re.DOTALL)
+    return len(' '.join(re.sub(r'<[^>]*>', ' ', ohne_skripte).split()))
+
+def lade_body_gestreamt(response, max_bytes=MAX_DOWNLOAD_BYTES, text_budget=TEXT_BUDGET_CHARS, abbruch_flag=None):
+    """
+    Liest den Body blockweise und stoppt nach max_bytes oder sobald geschätzt text_budget Zeichen Text vorliegen.
+    Gibt (body, gekuerzt) zurück; gekuerzt ist True, wenn der Download vorzeitig beendet wurde.
+    """
+    bloecke = []
+    gelesen = 0
+    naechste_pruefung = text_budget # Textschätzung nur bei Verdopplung der Datenmenge (lineare Gesamtkosten)
+    for block in response.iter_content(chunk_size=STREAM_CHUNK_SIZE):
+        bloecke.append(block)
+        gelesen += len(block)
+        if abbruch_flag is not None and abbruch_flag.is_set():
+            return b''.join(bloecke), True
+        if gelesen >= max_bytes:
+            return b''.join(bloecke)[:max_bytes], True
+        if text_budget and gelesen >= naechste_pruefung:
+            naechste_pruefung = gelesen * 2
+            if _geschaetzte_textlaenge(_dekodiere(b''.join(bloecke), _zeichensatz(response))) >= text_budget:
+                return b''.join(bloecke), True
+    return b''.join(bloecke), False
+
+def pruefe_ressource(headers):
+    """
+    Vorabprüfung anhand der Antwort-Header (Content-Type, Content-Length).
+    Gibt None zurück, wenn die Ressource geladen werden soll, sonst den Ablehnungsgrund.
+    """
+    content_type = headers.get('Content-Type', '').split(';')[0].strip().lower()
+    if content_type and content_type not in ALLOWED_CONTENT_TYPES:
+        return f"Nicht unterstützter Inhaltstyp: {content_type}"
+
+    content_length = headers.get('Content-Length', '')
+    if content_length.isdigit() and int(content_length) > MAX_CONTENT_LENGTH:
+        return f"Ressource zu groß: {int(content_length) // (1024 * 1024)} MB"
+    return None
+
+class StreamingTextExtraktor(HTMLParser):
+    """
+    Ereignisbasierte Textextraktion mit den Regeln von _extrahiere_text: Text aus CONTENT_TAGS (verschachtelte Tags
+    zählen wie bei find_all mehrfach), außerhalb von EXCLUDED_TAGS; Fallback main/article, dann der übrige Text.
+    Der Body wird blockweise per feed() übergeben; fertig wird True, sobald text_limit Zeichen Inhaltstext vorliegen.
+    """
+    VOID_TAGS = {'area', 'base', 'br', 'col', 'embed', 'hr', 'img', 'input', 'link', 'meta', 'source', 'track', 'wbr'}
+
+    def __init__(self, text_limit=STREAMING_TEXT_LIMIT):
+        super().__init__(convert_charrefs=True)
+        self.text_limit = text_limit
+        self.stapel = [] # Offene Tags: (tag, abschnitt, ist_container, ist_ausgeschlossen)
+        self.ausgeschlossen = 0 # Verschachtelungstiefe innerhalb von EXCLUDED_TAGS (und head)
+        self.abschnitte = [] # Textteile pro Inhalts-Tag in Reihenfolge der Start-Tags
+        self.offene_abschnitte = []
+        self.container_offen = False
+        self.container_gefunden = False
+        self.container_teile = []
+        self.uebrige_teile = [] # Für den Fallback ohne Inhalts- und Container-Tags
+        self.laenge = 0
+        self.uebrige_laenge = 0
+        self.fertig = False
+        self._puffer = [] # HTMLParser liefert Text an Blockgrenzen in Teilen; zusammengefügt wird beim nächsten Tag
+
+    def handle_starttag(self, tag, attrs):
+        self._leere_puffer()
+        if tag in self.VOID_TAGS:
+            return
+        # Nicht geschlossene Absätze/Listenpunkte schließen wie im HTML-Standard
+        if tag in ('p', 'li') and self.stapel and self.stapel[-1][0] == tag:
+            self._schliesse_bis(len(self.stapel) - 1)
+        ist_ausgeschlossen = tag in EXCLUDED_TAGS or tag == 'head'
+        if ist_ausgeschlossen:
+            self.ausgeschlossen += 1
+        abschnitt = None
+        if tag in CONTENT_TAGS and not self.ausgeschlossen:
+            abschnitt = len(self.abschnitte)
+            self.abschnitte.append([])
+            self.offene_abschnitte.append(abschnitt)
+        ist_container = tag in CONTAINER_TAGS and not self.container_gefunden and not self.ausgeschlossen
+        if ist_container:
+            self.container_offen = self.container_gefunden = True
+        self.stapel.append((tag, abschnitt, ist_container, ist_ausgeschlossen))
+
+    def handle_endtag(self, tag):
+        self._leere_puffer()
+        for i in range(len(self.stapel) - 1, -1, -1):
+            if self.stapel[i][0] == tag:
+                self._schliesse_bis(i)
+                return
+
+    def _schliesse_bis(self, index):
+        while len(self.stapel) > index:
+            _, abschnitt, ist_container, ist_ausgeschlossen = self.stapel.pop()
+            if ist_ausgeschlossen:
+                self.ausgeschlossen -= 1
+            if abschnitt is not None:
+                self.offene_abschnitte.remove(abschnitt)
+            if ist_container:
+                self.container_offen = False
+
+    def handle_comment(self, data):
+        self._leere_puffer()
+
+    def close(self):
+        super().close()
+        self._leere_puffer()
+
+    def handle_data(self, data):
+        if not self.ausgeschlossen and not self.fertig:
+            self._puffer.append(data)
+
+    def _leere_puffer(self):
+        if not self._puffer:
+            return
+        teil = ''.join(self._puffer).strip()
+        self._puffer = []
+        if not teil:
+            return
+        for abschnitt in self.offene_abschnitte:
+            self.abschnitte[abschnitt].append(teil)
+            self.laenge += len(teil)
+        # Fallback-Texte nur, solange kein Inhalts-Tag aufgetreten ist, und höchstens text_limit Zeichen
+        if not self.abschnitte and self.uebrige_laenge < self.text_limit:
+            if self.container_offen:
+                self.container_teile.append(teil)
+            self.uebrige_teile.append(teil)
+            self.uebrige_laenge += len(teil)
+        if self.laenge >= self.text_limit:
+            self.fertig = True
+
+    def text(self):
+        if self.abschnitte:
+            text = ' '.join(' '.join(teile) for teile in self.abschnitte)
+        elif self.container_gefunden:
+            text = ' '.join(self.container_teile)
+        else:
+            text = ' '.join(self.uebrige_teile)
+        return ' '.join(text.split())
+
+def extrahiere_text_gestreamt(response, max_bytes=MAX_DOWNLOAD_BYTES, abbruch_flag=None):
+    """
+    Dekodiert und parst den Body blockweise, während er eintrifft, und bricht den Download ab, sobald genug
+    Text vorliegt (StreamingTextExtraktor). Gibt (text, gelesene_bytes, gekuerzt) zurück.
+    """
+    extraktor = StreamingTextExtraktor()
+    try:
+        decoder = codecs.getincrementaldecoder(_zeichensatz(response))(errors='replace')
+    except LookupError:
+        decoder = codecs.getincrementaldecoder('utf-8')(errors='replace')
+    gelesen = 0
+    gekuerzt = False
+    for block in response.iter_content(chunk_size=STREAM_CHUNK_SIZE):
+        gelesen += len(block)
+        extraktor.feed(decoder.decode(block))
+        if extraktor.fertig or gelesen >= max_bytes or (abbruch_flag is not None and abbruch_flag.is_set()):
+            gekuerzt = True
+            break
+    else:
+        extraktor.feed(decoder.decode(b'', final=True))
+    extraktor.close()
+    return extraktor.text(), gelesen, gekuerzt
+
+def verfuegbare_parser():
+    """Installierte Parser-Backends in der Reihenfolge von PARSER_PRIORITAET."""
+    return [name for name in PARSER_PRIORITAET
+            if (SelectolaxParser is not None if name == 'selectolax' else builder_registry.lookup(name) is not None)]
+
+_aktiver_parser = None
+
+def waehle_parser(name=None):
+    """
+    Legt das Parser-Backend fest: name (bzw. PARSER_BACKEND), falls installiert, sonst das schnellste verfügbare.
+    Gibt den Namen des aktiven Backends zurück.
+    """
+    global _aktiver_parser
+    verfuegbar = verfuegbare_parser()
+    gewuenscht = name or PARSER_BACKEND
+    if gewuenscht and gewuenscht not in verfuegbar:
+        print(f"INFO: Parser-Backend '{gewuenscht}' nicht installiert, verwende '{verfuegbar[0]}'.")
+        gewuenscht = None
+    _aktiver_parser = gewuenscht or verfuegbar[0]
+    return _aktiver_parser
+
+def _bs4_parser():
+    """Tree-Builder für Stellen, die einen BeautifulSoup-Baum benötigen (selectolax ist kein bs4-Builder)."""
+    parser = _aktiver_parser or waehle_parser()
+    if parser == 'selectolax':
+        parser = next(name for name in verfuegbare_parser() if name != 'selectolax')
+    return parser
+
+# Teil-Parsing: Inhalts- und Container-Tags samt Unterbaum, dazu die Bereiche aus EXCLUDED_TAGS, die Inhalts-Tags
+# enthalten können (nav, footer, ...). Letztere bleiben erhalten, damit ihre Inhalts-Tags wie beim vollen DOM verworfen werden.
+_INHALTS_STRAINER = SoupStrainer(CONTENT_TAGS + CONTAINER_TAGS + ["nav", "footer", "header", "aside", "form"])
+
+def extrahiere_text_aus_html(html, parser=None, teilweise=None):
+    """
+    Bereinigter Text einer HTML-Seite mit dem gewählten Backend (gleiche Extraktionsregeln für alle Backends).
+    Mit teilweise (Standard: PARTIAL_PARSE) bauen die bs4-Backends nur die relevanten Tags auf; nur wenn weder
+    Inhalts- noch Container-Tags vorkommen, wird für den body-Fallback vollständig geparst.
+    """
+    parser = parser or _aktiver_parser or waehle_parser()
+    if parser == 'selectolax':
+        return _extrahiere_text_selectolax(html)
+    # html5lib unterstützt kein parse_only
+    if (PARTIAL_PARSE if teilweise is None else teilweise) and parser != 'html5lib':
+        soup = BeautifulSoup(html, parser, parse_only=_INHALTS_STRAINER)
+        for element in soup(EXCLUDED_TAGS):
+            element.decompose()
+        if soup.find(CONTENT_TAGS + CONTAINER_TAGS) is not None:
+            return _extrahiere_text(soup)
+    return _extrahiere_text(BeautifulSoup(html, parser))
+
+def _extrahiere_text_selectolax(html):
+    """Entspricht _extrahiere_text, arbeitet aber auf dem selectolax-Baum."""
+    baum = SelectolaxParser(html)
+    baum.strip_tags(EXCLUDED_TAGS)
+
+    content_tags = baum.css(', '.join(CONTENT_TAGS))
+    if content_tags:
+        text = ' '.join(tag.text(separator=' ', strip=True) for tag in content_tags)
+    else:
+        main_content = baum.css_first(', '.join(CONTAINER_TAGS))
+        if main_content:
+            text = main_content.text(separator=' ', strip=True)
+        else:
+            wurzel = baum.body or baum.root
+            text = wurzel.text(separator=' ', strip=True) if wurzel else ''
+
+    return ' '.join(text.split())
+
+# Prozess-Pool für die CPU-lastige Extraktion: Abruf (Threads) und Parsing (Prozesse) skalieren unabhängig,
+# ohne dass sich die Parser den GIL teilen. Start erst beim ersten Bedarf, danach Wiederverwendung über alle Suchen.
+_extraktions_pool = None
+_extraktions_pool_lock = threading.Lock()
+
+def _hole_extraktions_pool():
+    """Liefert den Extraktions-Pool (wird beim ersten Aufruf gestartet) oder None, wenn EXTRACTION_PROCESSES = 0."""
+    global _extraktions_pool
+    with _extraktions_pool_lock:
+        if _extraktions_pool is None and EXTRACTION_PROCESSES > 0:
+            # "spawn" statt fork: geforkte Kinder erben sonst Threads und Locks (Tk, Sessions, asyncio) in beliebigem Zustand
+            _extraktions_pool = ProcessPoolExecutor(max_workers=EXTRACTION_PROCESSES, mp_context=multiprocessing.get_context("spawn"))
+            print(f"INFO: Extraktions-Prozess-Pool mit {EXTRACTION_PROCESSES} Prozessen gestartet.")
+        return _extraktions_pool
+
+def _extrahiere_im_prozess(body, encoding, parser, teilweise):
+    """Worker-Funktion: Rohbytes rein, bereinigter Text raus (Parser und Modus kommen vom Hauptprozess)."""
+    return extrahiere_text_aus_html(_dekodiere(body, encoding), parser, teilweise)
+
+def extrahiere_text_aus_body(body, encoding, abbruch_flag=None):
+    """
+    Extrahiert den Text aus den Rohbytes einer Seite; ab EXTRACTION_PROCESS_MIN_BYTES in einem Worker-Prozess.
+    Fällt der Pool aus, wird im aufrufenden Thread extrahiert und der Pool beim nächsten Bedarf neu gestartet.
+    Wird abbruch_flag gesetzt, während der Worker noch arbeitet, wird der Auftrag storniert und "" geliefert.
+    """
+    global _extraktions_pool
+    parser = _aktiver_parser or waehle_parser()
+    pool = _hole_extraktions_pool() if len(body) >= EXTRACTION_PROCESS_MIN_BYTES else None
+    if pool is not None:
+        try:
+            auftrag = pool.submit(_extrahiere_im_prozess, body, encoding, parser, PARTIAL_PARSE)
+            while True:
+                try:
+                    return auftrag.result(timeout=ABBRUCH_POLL_INTERVAL)
+                except TimeoutError:
+                    if abbruch_flag is not None and abbruch_flag.is_set():
+                        auftrag.cancel() # wirkt nur, solange der Auftrag noch wartet; ein laufender Worker rechnet zu Ende
+                        return ""
+        except BrokenProcessPool:
+            print("INFO: Extraktions-Prozess-Pool ausgefallen, extrahiere im Thread.")
+            with _extraktions_pool_lock:
+                if _extraktions_pool is pool:
+                    _extraktions_pool = None
+    return _extrahiere_im_prozess(body, encoding, parser, PARTIAL_PARSE)
+
+def _extrahiere_text(soup):
+    """Entfernt Navigation, Skripte usw. und liefert den bereinigten Text der Inhalts-Tags (Fallback: main/article, body)."""
+    for element in soup(EXCLUDED_TAGS):
+        element.decompose()
+
+    content_tags = soup.find_all(CONTENT_TAGS)
+    if content_tags:
+        text = ' '.join(tag.get_text(separator=' ', strip=True) for tag in content_tags)
+    else:
+        main_content = soup.find(CONTAINER_TAGS)
+        if main_content:
+            text = main_content.get_text(separator=' ', strip=True)
+        else:
+            text = soup.body.get_text(separator=' ', strip=True) if soup.body else soup.get_text(separator=' ', strip=True)
+
+    return ' '.join(text.split())
+
+def get_text_from_url(url, current_proxy=None, abbruch_flag=None, timeout=20, info=None, timeout_gekuerzt=False):
     """
     Holt den reinen Text von einer URL, mit robuster Fallback-Logik.
+    Ist abbruch_flag gesetzt (anderer Kandidat erfolgreich oder Benutzerabbruch), wird der Abruf übersprungen.
+    Ist info ein dict, steht dort anschließend die Ziel-URL einer Weiterleitung (info['ziel']) und bei Erfolg,
+    ob der Download am Byte-/Text-Budget gekürzt wurde (info['gekuerzt']).
+    timeout_gekuerzt: der Timeout wurde vom Zeitbudget der Suche verkürzt; eine Zeitüberschreitung wird dann
+    weder Host noch Proxy angelastet.
     """
 
-    time.sleep(random.uniform(1.5, 3.5))
+    # Binärdateien (laut Dateiendung) gar nicht erst anfragen
+    if urlparse(url).path.lower().endswith(BINARY_URL_EXTENSIONS):
+        return f"[Übersprungen: {url} verweist auf eine Binärdatei.]", False
+
+    # Höflichkeitspause nur bei wiederholtem Zugriff auf denselben Host
+    _host_scheduler.warte(url, abbruch_flag)
+    if abbruch_flag is not None and abbruch_flag.is_set():
+        return "[Abruf abgebrochen.]", False
 
     INVALID_CONTENT_PHRASES = [
         "bitte klicken sie hier", "nicht automatisch weitergeleitet",
@@ -281,49 +1401,863 @@ def get_text_from_url(url, current_proxy=None):
 
         proxies = {"http": current_proxy, "https": current_proxy} if current_proxy else None
 
-        response = requests.get(url, headers=headers, timeout=20, proxies=proxies)
-        response.raise_for_status()
-
-        soup = BeautifulSoup(response.text, 'html.parser')
-
-        for element in soup(["script", "style", "nav", "footer", "header", "aside", "form", "meta", "link"]):
-            element.decompose()
-
-        content_tags = soup.find_all(['p', 'h1', 'h2', 'h3', 'li'])
-        if content_tags:
-            text = ' '.join(tag.get_text(separator=' ', strip=True) for tag in content_tags)
-        else:
-            main_content = soup.find(['main', 'article'])
-            if main_content:
-                text = main_content.get_text(separator=' ', strip=True)
-            else:
-                text = soup.body.get_text(separator=' ', strip=True)
-
-        cleaned_text = ' '.join(text.split())
+        # Bedingte Anfrage, falls eine gespeicherte Antwort mit Validator vorliegt
+        cache_eintrag = load_http_cache(url) if HTTP_CACHE_ENABLED else None
+        if cache_eintrag:
+            if cache_eintrag['etag']:
+                headers['If-None-Match'] = cache_eintrag['etag']
+            if cache_eintrag['last_modified']:
+                headers['If-Modified-Since'] = cache_eintrag['last_modified']
+
+        session = get_pooled_session(current_proxy)
+        gekuerzt = False
+        startzeit = time.monotonic()
+        with get_host_semaphore(url):
+            if PREFLIGHT_HEAD_REQUEST:
+                try:
+                    head_response = session.head(url, headers=headers, timeout=min(10, timeout), proxies=proxies, allow_redirects=True)
+                    ablehnung = pruefe_ressource(head_response.headers) if head_response.ok else None
+                except requests.exceptions.RequestException:
+                    ablehnung = None # HEAD nicht unterstützt: Prüfung erfolgt anhand der GET-Header
+                if ablehnung:
+                    url_negativ_cache.registriere(url, "typ", ablehnung)
+                    return f"[Übersprungen ({url}): {ablehnung}]", False
+
+            # Gestreamter Download: der Body wird nur bis zum Byte-/Text-Budget gelesen
+            response = session.get(url, headers=headers, timeout=timeout, proxies=proxies, stream=True)
+            latenz = time.monotonic() - startzeit
+            if info is not None and response.history:
+                info['ziel'] = response.url
+            try:
+                response.raise_for_status()
+                if response.status_code == 304 and cache_eintrag:
+                    print(f"INFO: HTTP-Cache gültig (304) für {url}")
+                    body, encoding = cache_eintrag['body'], cache_eintrag['encoding']
+                else:
+                    # Header-Prüfung, bevor der Body gelesen wird
+                    ablehnung = pruefe_ressource(response.headers)
+                    if ablehnung:
+                        url_negativ_cache.registriere(url, "typ", ablehnung)
+                        return f"[Übersprungen ({url}): {ablehnung}]", False
+                    if STREAMING_EXTRACTION:
+                        # Kein Body im Speicher (und damit kein HTTP-Cache-Eintrag): Text entsteht während des Downloads
+                        cleaned_text, gelesen, gekuerzt = extrahiere_text_gestreamt(response, abbruch_flag=abbruch_flag)
+                        body = None
+                    else:
+                        body, gekuerzt = lade_body_gestreamt(response, abbruch_flag=abbruch_flag)
+                        encoding = _zeichensatz(response)
+                        # Gekürzte Bodies nicht cachen: eine spätere 304-Antwort würde sonst den Teiltext als vollständig liefern
+                        if HTTP_CACHE_ENABLED and not gekuerzt:
+                            save_http_cache(url, response, body, encoding)
+            finally:
+                response.close()
+        if abbruch_flag is not None and abbruch_flag.is_set():
+            return "[Abruf abgebrochen.]", False
+
+        if body is not None:
+            cleaned_text = extrahiere_text_aus_body(body, encoding, abbruch_flag=abbruch_flag)
+            gelesen = len(body)
+            if abbruch_flag is not None and abbruch_flag.is_set():
+                return "[Abruf abgebrochen.]", False
 
         if len(cleaned_text) < MIN_TEXT_LENGTH:
+            url_negativ_cache.registriere(url, "zu_kurz", f"Länge: {len(cleaned_text)}")
             return f"[Konnte keinen substanziellen Text von dieser URL extrahieren - Länge: {len(cleaned_text)}]", False
 
         lower_text = cleaned_text.lower()
         if any(phrase in lower_text for phrase in INVALID_CONTENT_PHRASES):
+            host_health.registriere(url, "inhalt", latenz)
+            url_negativ_cache.registriere(url, "inhalt", "Weiterleitungs- oder Platzhalter-Text")
             return f"[Ungültiger Inhalt erkannt: Weiterleitungs- oder Platzhalter-Text.]", False
 
+        if gekuerzt:
+            # Kein Vermerk im Text (würde übersetzt und zusammengefasst), sondern als Metadatum in info
+            print(f"INFO: Download von {url} nach {gelesen // 1024} KB beendet (Budget erreicht).")
+        if info is not None:
+            info['gekuerzt'] = gekuerzt
+
+        host_health.registriere(url, None, latenz)
+        proxy_manager.registriere(current_proxy, True, latenz)
         return cleaned_text, True
 
     except requests.exceptions.HTTPError as http_err:
+        if current_proxy is not None and http_err.response.status_code in PROXY_BLOCK_STATUS_CODES:
+            proxy_manager.registriere(current_proxy, False) # Wie bei Timeouts: über einen Proxy nicht dem Host anlasten
+        else:
+            host_health.registriere(url, f"http_{http_err.response.status_code}")
+            url_negativ_cache.registriere(url, f"http_{http_err.response.status_code}", f"Code: {http_err.response.status_code}")
+            proxy_manager.registriere(current_proxy, True) # Der Proxy hat geantwortet, der Host hat abgelehnt
         error_msg = f"[Fehler: Die Seite {url} hat den Zugriff verweigert (Code: {http_err.response.status_code})]"
         return error_msg, (http_err.response.status_code not in [403, 404])
 
     except Exception as e:
+        # Netzwerkfehler nur bei Direktverbindung dem Host anlasten (sonst ist evtl. der Proxy schuld)
+        if timeout_gekuerzt and isinstance(e, requests.exceptions.Timeout):
+            pass # Das Zeitbudget war zu knapp, nicht der Host oder der Proxy zu langsam
+        elif current_proxy is None and isinstance(e, requests.exceptions.Timeout):
+            host_health.registriere(url, "timeout")
+            url_negativ_cache.registriere(url, "timeout", type(e).__name__)
+        elif current_proxy is None and isinstance(e, requests.exceptions.ConnectionError):
+            host_health.registriere(url, "verbindung")
+            url_negativ_cache.registriere(url, "verbindung", type(e).__name__)
+        if isinstance(e, requests.exceptions.ConnectionError) or (isinstance(e, requests.exceptions.Timeout) and not timeout_gekuerzt):
+            proxy_manager.registriere(current_proxy, False)
         error_msg = f"[Fehler beim Laden von {url}: {type(e).__name__}]"
         return error_msg, False
 
 
-def ki_wissensabruf_und_vergleich(anfrage, quelle_typ, stop_search_flag):
+def get_text_from_mediawiki(api_url, anfrage, current_proxy=None, abbruch_flag=None, timeout=20, timeout_gekuerzt=False):
+    """
+    Schnellweg für MediaWiki-Seiten: Sucht den besten Artikel über die Such-API und liefert dessen Klartext-Extrakt
+    als kompaktes JSON (kein HTML-Download, kein BeautifulSoup). Gibt (text, success, artikel_url) zurück.
+    timeout_gekuerzt wie bei get_text_from_url.
+    """
+    _host_scheduler.warte(api_url, abbruch_flag)
+    if abbruch_flag is not None and abbruch_flag.is_set():
+        return "[Abruf abgebrochen.]", False, api_url
+
+    params = {
+        'action': 'query', 'format': 'json', 'formatversion': 2, 'redirects': 1,
+        'generator': 'search', 'gsrsearch': anfrage, 'gsrlimit': 1,
+        'prop': 'extracts|info', 'inprop': 'url', 'explaintext': 1, 'exsectionformat': 'plain', 'exlimit': 1,
+    }
+    headers = {'User-Agent': random.choice(USER_AGENT_POOL), 'Accept': 'application/json'}
+    proxies = {"http": current_proxy, "https": current_proxy} if current_proxy else None
+
+    try:
+        session = get_pooled_session(current_proxy)
+        startzeit = time.monotonic()
+        with get_host_semaphore(api_url):
+            response = session.get(api_url, params=params, headers=headers, timeout=timeout, proxies=proxies)
+        latenz = time.monotonic() - startzeit
+        response.raise_for_status()
+        seiten = response.json().get('query', {}).get('pages', [])
+        if not seiten:
+            host_health.registriere(api_url, None, latenz)
+            return f"[Kein passender Artikel für '{anfrage}' gefunden.]", False, api_url
+
+        seite = seiten[0]
+        artikel_url = seite.get('fullurl', api_url)
+        text = ' '.join(seite.get('extract', '').split())[:TEXT_BUDGET_CHARS]
+        host_health.registriere(api_url, None, latenz)
+        proxy_manager.registriere(current_proxy, True, latenz)
+        if len(text) < MIN_TEXT_LENGTH:
+            return f"[Konnte keinen substanziellen Text von dieser URL extrahieren - Länge: {len(text)}]", False, artikel_url
+        return text, True, artikel_url
+
+    except requests.exceptions.HTTPError as http_err:
+        if current_proxy is not None and http_err.response.status_code in PROXY_BLOCK_STATUS_CODES:
+            proxy_manager.registriere(current_proxy, False)
+        else:
+            host_health.registriere(api_url, f"http_{http_err.response.status_code}")
+        return f"[Fehler: Die API {api_url} hat den Zugriff verweigert (Code: {http_err.response.status_code})]", False, api_url
+
+    except Exception as e:
+        if timeout_gekuerzt and isinstance(e, requests.exceptions.Timeout):
+            pass # Das Zeitbudget war zu knapp, nicht der Host oder der Proxy zu langsam
+        elif current_proxy is None and isinstance(e, requests.exceptions.Timeout):
+            host_health.registriere(api_url, "timeout")
+        elif current_proxy is None and isinstance(e, requests.exceptions.ConnectionError):
+            host_health.registriere(api_url, "verbindung")
+        if isinstance(e, requests.exceptions.ConnectionError) or (isinstance(e, requests.exceptions.Timeout) and not timeout_gekuerzt):
+            proxy_manager.registriere(current_proxy, False)
+        return f"[Fehler beim Laden von {api_url}: {type(e).__name__}]", False, api_url
+
+
+class SphinxSuchindex:
+    """
+    Lokale Suche im searchindex.js einer Sphinx-Dokumentation. Die Suchseite solcher Sites wird per JavaScript
+    gerendert und liefert ohne Browser keine Treffer; der Index wird daher einmal geladen (Tabelle suchindizes)
+    und lokal abgefragt, sodass nur noch die passende Seite abgerufen werden muss.
+    """
+    def __init__(self, base_url, index_url, db_name=DB_NAME):
+        self.base_url = base_url
+        self.index_url = index_url
+        self.db_name = db_name
+        self._index = None
+        self._stand = 0.0 # time.time() des Downloads, auf dem self._index beruht
+        self._lock = threading.Lock()
+
+    def _ist_aktuell(self):
+        return self._index is not None and time.time() - self._stand < SPHINX_INDEX_MAX_AGE_DAYS * 86400
+
+    def _lade_gespeichert(self):
+        """Liefert (inhalt, stand) des gespeicherten Index, falls er jünger als SPHINX_INDEX_MAX_AGE_DAYS ist, sonst None."""
+        try:
+            conn = sqlite3.connect(self.db_name)
+            cursor = conn.cursor()
+            cursor.execute("SELECT inhalt, CAST(strftime('%s', timestamp) AS INTEGER) FROM suchindizes "
+                           "WHERE url = ? AND timestamp >= datetime('now', ?)",
+                           (self.index_url, f"-{SPHINX_INDEX_MAX_AGE_DAYS * 86400} seconds"))
+            row = cursor.fetchone()
+            conn.close()
+            return row
+        except Exception as e:
+            print(f"Fehler beim Laden des Suchindex: {e}")
+            return None
+
+    def _herunterladen(self, current_proxy, frist, abbruch_flag):
+        """Lädt searchindex.js gestreamt; bricht bei gesetztem abbruch_flag oder nach Ablauf der frist ab (dann None)."""
+        proxies = {"http": current_proxy, "https": current_proxy} if current_proxy else None
+        try:
+            session = get_pooled_session(current_proxy)
+            with session.get(self.index_url, headers={'User-Agent': random.choice(USER_AGENT_POOL)},
+                             timeout=max(0.1, frist - time.monotonic()), proxies=proxies, stream=True) as response:
+                response.raise_for_status()
+                bloecke = []
+                for block in response.iter_content(chunk_size=STREAM_CHUNK_SIZE):
+                    if (abbruch_flag is not None and abbruch_flag.is_set()) or time.monotonic() > frist:
+                        print(f"INFO: Download des Suchindex {self.index_url} abgebrochen (Abbruch oder Zeitbudget).")
+                        return None
+                    bloecke.append(block)
+                return _dekodiere(b''.join(bloecke), _zeichensatz(response))
+        except requests.exceptions.RequestException as e:
+            print(f"Fehler beim Herunterladen des Suchindex {self.index_url}: {type(e).__name__}")
+            return None
+
+    def _speichere(self, inhalt):
+        try:
+            conn = sqlite3.connect(self.db_name)
+            cursor = conn.cursor()
+            cursor.execute("INSERT OR REPLACE INTO suchindizes (url, inhalt, timestamp) VALUES (?, ?, CURRENT_TIMESTAMP)",
+                           (self.index_url, inhalt))
+            conn.commit()
+            conn.close()
+        except Exception as e:
+            print(f"Fehler beim Speichern des Suchindex: {e}")
+
+    def _lade_index(self, current_proxy=None, timeout=30, abbruch_flag=None):
+        """
+        Liefert den geparsten Index (aus dem Speicher, der DB oder per Download) oder None. Nach
+        SPHINX_INDEX_MAX_AGE_DAYS wird neu geladen; schlägt das fehl, bleibt der bisherige Index in Gebrauch.
+        Warten auf einen parallelen Download und der eigene Download enden nach timeout (s) oder bei abbruch_flag.
+        """
+        if self._ist_aktuell():
+            return self._index
+        frist = time.monotonic() + timeout
+        while not self._lock.acquire(timeout=ABBRUCH_POLL_INTERVAL):
+            if (abbruch_flag is not None and abbruch_flag.is_set()) or time.monotonic() > frist:
+                return self._index
+        try:
+            if self._ist_aktuell(): # Ein paralleler Aufruf hat inzwischen geladen
+                return self._index
+            gespeichert = self._lade_gespeichert()
+            if gespeichert:
+                inhalt, stand = gespeichert
+            else:
+                inhalt, stand = self._herunterladen(current_proxy, frist, abbruch_flag), time.time()
+                if inhalt is None:
+                    return self._index
+                self._speichere(inhalt)
+                print(f"INFO: Suchindex {self.index_url} geladen ({len(inhalt) // 1024} KB).")
+            try:
+                # Format: Search.setIndex({...JSON...})
+                self._index = json.loads(inhalt[inhalt.index('(') + 1:inhalt.rindex(')')])
+                self._stand = stand
+            except ValueError as e:
+                print(f"Fehler beim Parsen des Suchindex {self.index_url}: {e}")
+            return self._index
+        finally:
+            self._lock.release()
+
+    @staticmethod
+    def _dokumente(eintrag):
+        return eintrag if isinstance(eintrag, list) else [eintrag]
+
+    @staticmethod
+    def _finde_term(tabelle, wort):
+        """Exakter Term oder Wortstamm (Sphinx indexiert Stämme), nur durch Abschneiden kurzer Endungen."""
+        if wort in tabelle:
+            return tabelle[wort]
+        for laenge in range(len(wort) - 1, max(len(wort) - SPHINX_MAX_SUFFIX, SPHINX_MIN_STEM) - 1, -1):
+            if wort[:laenge] in tabelle:
+                return tabelle[wort[:laenge]]
+        return None
+
+    def suche(self, anfrage, current_proxy=None, max_treffer=3, timeout=30, abbruch_flag=None):
+        """
+        Gibt die besten Treffer als Liste von (url, titel) zurück. Eine Seite muss mindestens SPHINX_MIN_WORD_SHARE
+        der aussagekräftigen Suchwörter enthalten; Titeltreffer zählen mehr. Ohne ausreichenden Treffer: [].
+        timeout und abbruch_flag begrenzen ein nötiges (Neu-)Laden des Index.
+        """
+        index = self._lade_index(current_proxy, timeout, abbruch_flag)
+        if not index:
+            return []
+        terms, titleterms = index.get('terms', {}), index.get('titleterms', {})
+        docnames, titles = index.get('docnames', []), index.get('titles', [])
+        max_dokumente = max(1, int(len(docnames) * SPHINX_MAX_DOC_SHARE))
+
+        woerter = []
+        for wort in set(re.findall(r'\w{4,}', anfrage.lower())) - KORPUS_STOPWOERTER:
+            treffer = self._finde_term(terms, wort)
+            # Allgegenwärtige Terme (z.B. 'python' in der Python-Doku) tragen nichts zur Auswahl bei
+            if treffer is not None and len(self._dokumente(treffer)) > max_dokumente:
+                continue
+            woerter.append((wort, treffer))
+        if not woerter:
+            return []
+
+        punkte, getroffene_woerter = {}, {}
+        for wort, treffer in woerter:
+            gewichte = {dokument: 1 for dokument in self._dokumente(treffer)} if treffer is not None else {}
+            titel_treffer = self._finde_term(titleterms, wort)
+            if titel_treffer is not None:
+                gewichte.update({dokument: 5 for dokument in self._dokumente(titel_treffer)})
+            for dokument, gewicht in gewichte.items():
+                punkte[dokument] = punkte.get(dokument, 0) + gewicht
+                getroffene_woerter[dokument] = getroffene_woerter.get(dokument, 0) + 1
+
+        kandidaten = [d for d in punkte if getroffene_woerter[d] / len(woerter) >= SPHINX_MIN_WORD_SHARE]
+        beste = sorted(kandidaten, key=lambda d: (getroffene_woerter[d], punkte[d]), reverse=True)[:max_treffer]
+        return [(f"{self.base_url}{docnames[i]}.html", titles[i] if i < len(titles) else docnames[i])
+                for i in beste if i < len(docnames)]
+
+sphinx_suchindizes = {base_url: SphinxSuchindex(base_url, index_url) for base_url, index_url in SPHINX_SEARCH_INDEXES.items()}
+
+
+def speichere_im_korpus(url, titel, text):
+    """Legt einen Artikel komprimiert im Korpus ab (ersetzt eine ältere Fassung) und aktualisiert den Volltextindex."""
+    try:
+        conn = sqlite3.connect(KORPUS_DB_NAME)
+        cursor = conn.cursor()
+        cursor.execute("SELECT id, titel, text_zlib FROM korpus WHERE url = ?", (url,))
+        alt = cursor.fetchone()
+        if alt:
+            # Inhaltsloser FTS5-Index: Löschen erfordert die ursprünglich indexierten Werte
+            cursor.execute("INSERT INTO korpus_index (korpus_index, rowid, titel, text) VALUES ('delete', ?, ?, ?)",
+                           (alt[0], alt[1], zlib.decompress(alt[2]).decode('utf-8')))
+            cursor.execute("UPDATE korpus SET titel = ?, text_zlib = ?, timestamp = CURRENT_TIMESTAMP WHERE id = ?",
+                           (titel, zlib.compress(text.encode('utf-8'), 9), alt[0]))
+            rowid = alt[0]
+        else:
+            cursor.execute("INSERT INTO korpus (url, titel, text_zlib) VALUES (?, ?, ?)", (url, titel, zlib.compress(text.encode('utf-8'), 9)))
+            rowid = cursor.lastrowid
+        cursor.execute("INSERT INTO korpus_index (rowid, titel, text) VALUES (?, ?, ?)", (rowid, titel, text))
+        conn.commit()
+        conn.close()
+        return True
+    except Exception as e:
+        print(f"Fehler beim Speichern im Korpus: {e}")
+        return False
+
+def suche_im_korpus(anfrage, max_treffer=KORPUS_MAX_TREFFER):
+    """
+    Volltextsuche im lokalen Korpus (alle Suchwörter ab 3 Zeichen außer KORPUS_STOPWOERTER müssen vorkommen, Rangfolge nach BM25).
+    Gibt Quellen im Format des Whitelist-Vergleichs zurück (title, href, text_original).
+    """
+    woerter = [wort for wort in normalize_query(anfrage).split() if len(wort) >= 3 and wort not in KORPUS_STOPWOERTER]
+    if not woerter:
+        return []
+    try:
+        conn = sqlite3.connect(KORPUS_DB_NAME)
+        cursor = conn.cursor()
+        cursor.execute("SELECT korpus.url, korpus.titel, korpus.text_zlib FROM korpus_index "
+                       "JOIN korpus ON korpus.id = korpus_index.rowid "
+                       "WHERE korpus_index MATCH ? ORDER BY bm25(korpus_index) LIMIT ?",
+                       (' '.join(f'"{wort}"' for wort in woerter), max_treffer))
+        treffer = [{'title': f"Korpus: {titel or urlparse(url).netloc}", 'href': url,
+                    'text_original': zlib.decompress(text_zlib).decode('utf-8')}
+                   for url, titel, text_zlib in cursor.fetchall()]
+        conn.close()
+        return treffer
+    except Exception as e:
+        print(f"Fehler bei der Suche im Korpus: {e}")
+        return []
+
+_robots_cache = {}
+
+def _darf_crawlen(url, session):
+    """Prüft robots.txt des Hosts (einmal pro Host geladen; nicht erreichbar = erlaubt)."""
+    teile = urlparse(url)
+    basis = f"{teile.scheme}://{teile.netloc}"
+    if basis not in _robots_cache:
+        robots = RobotFileParser()
+        try:
+            response = session.get(f"{basis}/robots.txt", headers={'User-Agent': USER_AGENT_POOL[0]}, timeout=10)
+            robots.parse(response.text.splitlines() if response.ok else [])
+        except requests.exceptions.RequestException:
+            robots.parse([])
+        _robots_cache[basis] = robots
+    return _robots_cache[basis].can_fetch("*", url)
+
+def crawle_korpus(seeds=None, max_seiten_pro_host=KORPUS_MAX_PAGES_PER_HOST, abbruch_flag=None):
+    """
+    Crawler-Modus: Durchläuft ab jeder Seed-URL (Standard: RELIABLE_URL_WHITELIST) die Seiten unterhalb dieser URL
+    in Breitensuche, höflich pro Host und unter Beachtung von robots.txt, und legt den extrahierten Text im Korpus ab.
+    Gibt die Anzahl der gespeicherten Seiten zurück.
+    """
+    initialize_korpus_db()
+    gesamt = 0
+    for seed in (seeds or RELIABLE_URL_WHITELIST):
+        warteschlange = deque([seed])
+        besucht = set()
+        gespeichert = 0
+        while warteschlange and gespeichert < max_seiten_pro_host:
+            if abbruch_flag is not None and abbruch_flag.is_set():
+                return gesamt
+            url = warteschlange.popleft()
+            if url in besucht or urlparse(url).path.lower().endswith(BINARY_URL_EXTENSIONS):
+                continue
+            besucht.add(url)
+            if host_health.ist_gesperrt(url):
+                print(f"INFO: Crawler überspringt {seed} (Host vorübergehend gesperrt).")
+                break
+
+            session = get_pooled_session()
+            if not _darf_crawlen(url, session):
+                continue
+            _host_scheduler.warte(url, abbruch_flag)
+            try:
+                with get_host_semaphore(url):
+                    response = session.get(url, headers={'User-Agent': random.choice(USER_AGENT_POOL)}, timeout=20, stream=True)
+                    try:
+                        response.raise_for_status()
+                        if pruefe_ressource(response.headers):
+                            continue
+                        body, _ = lade_body_gestreamt(response, abbruch_flag=abbruch_flag)
+                        encoding = _zeichensatz(response)
+                        final_url = response.url
+                    finally:
+                        response.close()
+                host_health.registriere(url, None)
+            except requests.exceptions.RequestException as e:
+                print(f"INFO: Crawler konnte {url} nicht laden: {type(e).__name__}")
+                continue
+
+            soup = BeautifulSoup(_dekodiere(body, encoding), _bs4_parser())
+            # Links vor der Bereinigung sammeln (Navigation wird von _extrahiere_text entfernt)
+            for link in soup.find_all('a', href=True):
+                ziel = urldefrag(urljoin(final_url, link['href']))[0]
+                if ziel.startswith(seed) and ziel not in besucht:
+                    warteschlange.append(ziel)
+            titel = soup.title.get_text(strip=True) if soup.title else None
+            text = _extrahiere_text(soup)
+            if len(text) >= MIN_TEXT_LENGTH and speichere_im_korpus(final_url, titel, text[:TEXT_BUDGET_CHARS]):
+                gespeichert += 1
+        print(f"INFO: Crawler: {gespeichert} Seiten von {seed} im Korpus gespeichert.")
+        gesamt += gespeichert
+    return gesamt
+
+
+class DaemonThreadPool(Executor):
+    """
+    Thread-Pool mit Daemon-Threads. Anders als ThreadPoolExecutor (dessen Threads beim Programmende gejoint werden)
+    wartet das Beenden der GUI nicht auf abgekoppelte Abrufe oder Übersetzungen, die noch bis zu ihrem Timeout laufen.
+    Threads werden bei Bedarf gestartet, bis max_workers erreicht ist, und danach wiederverwendet.
+    """
+    def __init__(self, max_workers, thread_name_prefix):
+        self.max_workers = max_workers
+        self.thread_name_prefix = thread_name_prefix
+        self._auftraege = queue.SimpleQueue()
+        self._leerlauf = threading.Semaphore(0) # Anzahl wartender Threads
+        self._threads = []
+        self._lock = threading.Lock()
+
+    def submit(self, fn, /, *args, **kwargs):
+        future = Future()
+        self._auftraege.put((future, fn, args, kwargs))
+        with self._lock:
+            if not self._leerlauf.acquire(blocking=False) and len(self._threads) < self.max_workers:
+                thread = threading.Thread(target=self._arbeite, name=f"{self.thread_name_prefix}_{len(self._threads)}", daemon=True)
+                thread.start()
+                self._threads.append(thread)
+        return future
+
+    def _arbeite(self):
+        while True:
+            future, fn, args, kwargs = self._auftraege.get()
+            if future.set_running_or_notify_cancel():
+                try:
+                    ergebnis = fn(*args, **kwargs)
+                except BaseException as e:
+                    future.set_exception(e)
+                else:
+                    future.set_result(ergebnis)
+            del future, fn, args, kwargs
+            self._leerlauf.release()
+
+# Thread-Pool für blockierende Aufrufe der asyncio-Engine (requests, DDGS, Übersetzung, SQLite).
+# Bewusst nicht der Default-Executor: asyncio.run() wartet sonst beim Abbruch auf laufende Threads.
+# Daemon-Threads, damit ein Beenden während oder direkt nach einem Abbruch nicht auf hängende Abrufe wartet.
+_io_executor = DaemonThreadPool(max_workers=IO_THREADS, thread_name_prefix="wissens_ki_io")
+
+async def _im_thread(func, *args):
+    """Führt einen blockierenden Aufruf im I/O-Thread-Pool aus, ohne die Event-Loop zu blockieren."""
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(_io_executor, functools.partial(func, *args))
+
+async def _im_thread_abbrechbar(func, *args):
+    """
+    Wie _im_thread, übergibt func aber zusätzlich ein abbruch_flag. Wird die Task abgebrochen,
+    wird das Flag gesetzt, sodass der Thread seine Wartezeiten und Schleifen sofort verlässt.
+    """
+    abbruch_flag = threading.Event()
+    try:
+        return await _im_thread(func, *args, abbruch_flag)
+    finally:
+        abbruch_flag.set()
+
+
+class SucheAbgebrochen(Exception):
+    """Wird ausgelöst, sobald der Benutzer die Suche über stop_search_flag abbricht."""
+    def __init__(self, erkannt):
+        super().__init__("Suche durch den Benutzer abgebrochen.")
+        self.erkannt = erkannt # time.monotonic() beim Erkennen des Abbruchs
+
+
+async def _ueberwache_abbruch(stop_search_flag, intervall=ABBRUCH_POLL_INTERVAL):
+    """Wächter-Task: Löst SucheAbgebrochen aus, sobald stop_search_flag gesetzt ist."""
+    while not stop_search_flag.is_set():
+        await asyncio.sleep(intervall)
+    raise SucheAbgebrochen(time.monotonic())
+
+
+def _ddgs_text(suchanfrage, current_proxy, max_results=8, timeout=20):
+    """Blockierender DDGS-Aufruf (läuft im I/O-Thread-Pool); das Ergebnis fließt in die Proxy-Statistik ein."""
+    startzeit = time.monotonic()
+    try:
+        with DDGS(timeout=timeout, proxy=current_proxy) as ddgs:
+            results = list(ddgs.text(suchanfrage, max_results=max_results))
+    except Exception as e:
+        proxy_manager.registriere(current_proxy, False, time.monotonic() - startzeit)
+        # Nur ein echtes Rate-Limit bzw. eine Blockade bremst den Limiter: ddgs meldet Blockaden als
+        # RatelimitException; ein Statuscode wird nur ausgewertet, wenn die Ausnahme eine Antwort mitführt
+        status_code = getattr(getattr(e, 'response', None), 'status_code', None)
+        if isinstance(e, RatelimitException) or status_code in (202, 403, 429):
+            ddgs_limiter.blockiert()
+        raise
+    proxy_manager.registriere(current_proxy, True, time.monotonic() - startzeit)
+    if results:
+        ddgs_limiter.erfolg()
+    return results
+
+
+class Zeitbudget:
+    """Gesamt-Zeitbudget einer Suche: Stufen erhalten Anteile am Rest, HTTP-Timeouts schrumpfen mit."""
+    def __init__(self, sekunden=None):
+        self.ende = time.monotonic() + sekunden if sekunden else None
+
+    def verbleibend(self):
+        """Restbudget in Sekunden (None = unbegrenzt)."""
+        return None if self.ende is None else max(0.0, self.ende - time.monotonic())
+
+    def anteil(self, faktor):
+        """Frist (s) für eine Stufe als Anteil am Restbudget (None = unbegrenzt)."""
+        rest = self.verbleibend()
+        return None if rest is None else rest * faktor
+
+    def timeout(self, standard):
+        """Timeout für eine Einzelanfrage: höchstens standard, höchstens das Restbudget, mind. DEADLINE_REQUEST_MIN."""
+        rest = self.verbleibend()
+        return standard if rest is None else max(DEADLINE_REQUEST_MIN, min(standard, rest))
+
+    def abgelaufen(self):
+        return self.ende is not None and time.monotonic() >= self.ende
+
+
+class HedgeBudget:
+    """Begrenzt die Anzahl abgesicherter Zweitanfragen (Hedges) pro Suche."""
+    def __init__(self, anzahl=HEDGE_BUDGET_PER_SEARCH):
+        self.verbleibend = anzahl
+
+    def entnehme(self):
+        if self.verbleibend <= 0:
+            return False
+        self.verbleibend -= 1
+        return True
+
+
+# Dauer erfolgreicher Seitenabrufe (s) als Grundlage der adaptiven Hedge-Schwelle
+_abruf_latenzen = deque(maxlen=200)
+
+def hedge_schwelle():
+    """Adaptive Wartezeit bis zum Hedge: HEDGE_PERCENTILE der bisherigen Abrufdauern (mind. HEDGE_MIN_DELAY)."""
+    if len(_abruf_latenzen) < 10:
+        return HEDGE_DEFAULT_DELAY
+    latenzen = sorted(_abruf_latenzen)
+    return max(HEDGE_MIN_DELAY, latenzen[min(len(latenzen) - 1, int(len(latenzen) * HEDGE_PERCENTILE))])
+
+
+async def lade_url_async(url, current_proxy, hedge_budget=None, zeitbudget=None, info=None):
+    """
+    Lädt eine URL im I/O-Thread-Pool. Ist Hedging aktiv und das Budget nicht erschöpft, wird der Abruf nach
+    hedge_schwelle() über eine andere Route (anderer Proxy bzw. Direktverbindung) erneut gestartet;
+    die erste erfolgreiche Antwort gewinnt, der Verlierer wird abgebrochen.
+    Mit zeitbudget schrumpft der HTTP-Timeout mit dem verbleibenden Budget der Suche.
+    info (dict) erhält die Angaben des gewinnenden Abrufs (siehe get_text_from_url).
+    """
+    startzeit = time.monotonic()
+    abruf_timeout = zeitbudget.timeout(20) if zeitbudget else 20
+    infos = {} # Pro Abruf ein eigenes dict, damit der Verlierer die Angaben des Gewinners nicht überschreibt
+
+    def starte(proxy):
+        abruf_info = {}
+        abruf = functools.partial(get_text_from_url, timeout=abruf_timeout, info=abruf_info, timeout_gekuerzt=abruf_timeout < 20)
+        task = asyncio.create_task(_im_thread_abbrechbar(abruf, url, proxy))
+        infos[task] = abruf_info
+        return task
+
+    primaer = starte(current_proxy)
+    hedge = None
+    try:
+        if HEDGING_ENABLED and hedge_budget is not None:
+            await asyncio.wait({primaer}, timeout=hedge_schwelle())
+            alternative = proxy_manager.waehle(ausser=current_proxy)
+            if not primaer.done() and alternative != current_proxy and hedge_budget.entnehme():
+                print(f"INFO: Hedge für {url} nach {time.monotonic() - startzeit:.1f}s über {alternative or 'Direktverbindung'}.")
+                hedge = starte(alternative)
+
+        if hedge is None:
+            gewinner = primaer
+            inhalt, success = await primaer
+        else:
+            ausstehend = {primaer, hedge}
+            ergebnisse = {}
+            gewinner = None
+            while ausstehend and gewinner is None:
+                fertig, ausstehend = await asyncio.wait(ausstehend, return_when=asyncio.FIRST_COMPLETED)
+                for task in fertig:
+                    ergebnisse[task] = task.result()
+                gewinner = next((task for task, ergebnis in ergebnisse.items() if ergebnis[1]), None)
+            # Ohne Erfolg zählt die Fehlermeldung des Primärabrufs
+            gewinner = gewinner or primaer
+            inhalt, success = ergebnisse[gewinner]
+
+        if info is not None:
+            info.update(infos[gewinner])
+        if success:
+            _abruf_latenzen.append(time.monotonic() - startzeit)
+        return inhalt, success
+    finally:
+        # Verlierer (oder bei Abbruch beide) beenden; _im_thread_abbrechbar setzt dabei das Abbruch-Flag
+        for task in (primaer, hedge):
+            if task is not None and not task.done():
+                task.cancel()
+
+
+async def lade_kandidaten_async(kandidaten, current_proxy, max_parallel=PARALLEL_CANDIDATE_FETCHES, hedge_budget=None, zeitbudget=None):
+    """
+    Lädt die Kandidaten (Liste aus (index, result)) mit begrenzter Parallelität in einer TaskGroup.
+    Gewinner ist der erste erfolgreiche Kandidat in Rangfolge; alle übrigen Abrufe werden abgebrochen.
+    Gibt ((index, result, inhalt, info) oder None, fehler_log) zurück (info wie bei lade_url_async).
+    """
+    fehler_log = []
+    gewinner = None
+    if not kandidaten:
+        return gewinner, fehler_log
+
+    semaphore = asyncio.Semaphore(max(1, max_parallel))
+
+    async def lade(url, info):
+        async with semaphore:
+            return await lade_url_async(url, current_proxy, hedge_budget, zeitbudget, info)
+
+    infos = [{} for _ in kandidaten]
+    async with asyncio.TaskGroup() as tg:
+        tasks = [tg.create_task(lade(result.get('href'), info)) for (_, result), info in zip(kandidaten, infos)]
+        for (i, result), task, info in zip(kandidaten, tasks, infos):
+            inhalt, success = await task
+            if success:
+                gewinner = (i, result, inhalt, info)
+                break
+            fehler_log.append(f"Quelle #{i+1} ({result.get('href')}): {inhalt}")
+        # Verlierer abbrechen; laufende Abrufe beenden sich über ihr Abbruch-Flag
+        for task in tasks:
+            task.cancel()
+    return gewinner, fehler_log
+
+def build_whitelist_url(base_url, suchstring_query):
+    """Baut die Such-URL für eine Whitelist-Quelle."""
+    domain_name = base_url.split('/')[2]
+    if "wikipedia.org/" in base_url and "/wiki/" not in base_url:
+        return f"{base_url}w/index.php?search={suchstring_query}"
+    elif "spektrum.de/lexikon" in base_url:
+        return f"{base_url}{suchstring_query}"
+    elif "docs.python.org/3/" in base_url:
+        return f"{base_url}search.html?q={suchstring_query}"
+    elif domain_name in ["www.nasa.gov", "www.nih.gov", "www.epa.gov", "www.eia.gov", "www.usgs.gov", "www.nature.com", "www.sciencemag.org", "www.science.org"]:
+        return f"{base_url}search?q={suchstring_query}"
+    elif domain_name == "www.sciencedirect.com":
+        return f"{base_url}search?qs={suchstring_query}"
+    else:
+        return f"{base_url}suche?q={suchstring_query}"
+
+
+async def lade_whitelist_quellen_async(anfrage, max_parallel=WHITELIST_MAX_CONNECTIONS, hedge_budget=None, zeitbudget=None, frist=None):
+    """
+    Lädt alle Whitelist-Quellen gleichzeitig in einer TaskGroup (global max_parallel, pro Host MAX_CONNECTIONS_PER_HOST).
+    Nach Ablauf der frist (s) werden offene Abrufe abgebrochen und die bis dahin geladenen Quellen verwendet.
+    Gibt (erfolgreiche Quellen in Whitelist-Reihenfolge, komplett) zurück.
+    """
+    suchstring_query = anfrage.replace(" ", "+")
+    semaphore = asyncio.Semaphore(max(1, max_parallel))
+
+    async def lade(base_url):
+        current_proxy = proxy_manager.waehle()
+        if base_url in MEDIAWIKI_API_ENDPOINTS:
+            return await lade_mediawiki(base_url, current_proxy)
+        if base_url in sphinx_suchindizes:
+            return await lade_sphinx(base_url, current_proxy)
+        info = {}
+        # Erst im Semaphor nachschlagen: Plätze werden so in Whitelist-Reihenfolge vergeben, nicht in der
+        # zufälligen Reihenfolge, in der die DB-Abfragen der Tasks fertig werden
+        async with semaphore:
+            # Bekannte Ziel-URL (Artikel) statt der Such-URL mit ihrer Weiterleitungskette
+            ziel_url = await _im_thread(load_resolved_url, base_url, anfrage)
+            final_url = ziel_url or build_whitelist_url(base_url, suchstring_query)
+            print(f"INFO: Versuche, Whitelist-Quelle zu laden: {final_url}{' (aufgelöste Ziel-URL)' if ziel_url else ''}")
+            inhalt, success = await lade_url_async(final_url, current_proxy, hedge_budget, zeitbudget, info)
+        if ziel_url and not success:
+            await _im_thread(save_resolved_url, base_url, anfrage, None)
+        elif success and not ziel_url and info.get('ziel'):
+            await _im_thread(save_resolved_url, base_url, anfrage, info['ziel'])
+        if not success:
+            return None
+        return {
+            'title': f"Whitelist: {base_url.split('/')[2]}",
+            'href': final_url,
+            'text_original': inhalt,
+            'gekuerzt': info.get('gekuerzt', False)
+        }
+
+    async def lade_sphinx(base_url, current_proxy):
+        async with semaphore:
+            try:
+                treffer = await _im_thread_abbrechbar(sphinx_suchindizes[base_url].suche, anfrage, current_proxy, 1,
+                                                      zeitbudget.timeout(30) if zeitbudget else 30)
+            except Exception as e:
+                # Fremdes Indexformat: ein Fehler darf nicht die TaskGroup und damit alle Whitelist-Abrufe beenden
+                print(f"Fehler bei der Suche im Suchindex von {base_url}: {type(e).__name__}: {e}")
+                return None
+            if not treffer:
+                print(f"INFO: Kein Treffer im lokalen Suchindex von {base_url}, Abruf übersprungen.")
+                return None
+            seiten_url, titel = treffer[0]
+            print(f"INFO: Lokaler Suchindex von {base_url}: '{titel}' -> {seiten_url}")
+            info = {}
+            inhalt, success = await lade_url_async(seiten_url, current_proxy, hedge_budget, zeitbudget, info)
+        if not success:
+            return None
+        return {
+            'title': f"Whitelist: {base_url.split('/')[2]} ({titel})",
+            'href': seiten_url,
+            'text_original': inhalt,
+            'gekuerzt': info.get('gekuerzt', False)
+        }
+
+    async def lade_mediawiki(base_url, current_proxy):
+        api_url = MEDIAWIKI_API_ENDPOINTS[base_url]
+        abruf_timeout = zeitbudget.timeout(20) if zeitbudget else 20
+        abruf = functools.partial(get_text_from_mediawiki, timeout=abruf_timeout, timeout_gekuerzt=abruf_timeout < 20)
+        async with semaphore:
+            print(f"INFO: Versuche, Whitelist-Quelle über die MediaWiki-API zu laden: {api_url}")
+            inhalt, success, artikel_url = await _im_thread_abbrechbar(abruf, api_url, anfrage, current_proxy)
+        if not success:
+            return None
+        return {
+            'title': f"Whitelist: {base_url.split('/')[2]}",
+            'href': artikel_url,
+            'text_original': inhalt
+        }
+
+    quellen = [base_url for base_url in RELIABLE_URL_WHITELIST if not host_health.ist_gesperrt(base_url)]
+    if len(quellen) < len(RELIABLE_URL_WHITELIST):
+        print(f"INFO: {len(RELIABLE_URL_WHITELIST) - len(quellen)} Whitelist-Quellen vorübergehend gesperrt (Circuit offen).")
+
+    komplett = True
+    async with asyncio.TaskGroup() as tg:
+        tasks = [tg.create_task(lade(base_url)) for base_url in quellen]
+        if frist is not None:
+            _, offen = await asyncio.wait(tasks, timeout=frist)
+            komplett = not offen
+            for task in offen:
+                task.cancel()
+    if not komplett:
+        print(f"INFO: Zeitanteil für den Whitelist-Abruf aufgebraucht, {len(offen)} Abrufe abgebrochen.")
+    return [task.result() for task in tasks if not task.cancelled() and task.result()], komplett
+
+
+async def uebersetze_quellen_async(quellen, max_parallel=TRANSLATION_PARALLEL, frist=None):
+    """
+    Übersetzt die Texte mehrerer Quellen gleichzeitig (Ergebnis in item['text']).
+    Nach Ablauf der frist (s) behalten noch offene Quellen ihren Originaltext. Gibt False zurück, wenn die frist griff.
+    """
+    semaphore = asyncio.Semaphore(max(1, max_parallel))
+    for item in quellen:
+        item['text'] = item['text_original']
+
+    async def uebersetze(item):
+        async with semaphore:
+            item['text'] = await _im_thread_abbrechbar(translate_to_german, item['text_original'])
+
+    komplett = True
+    async with asyncio.TaskGroup() as tg:
+        tasks = [tg.create_task(uebersetze(item)) for item in quellen]
+        if frist is not None:
+            _, offen = await asyncio.wait(tasks, timeout=frist)
+            komplett = not offen
+            for task in offen:
+                task.cancel()
+    return komplett
+
+
+def ki_wissensabruf_und_vergleich(anfrage, quelle_typ, stop_search_flag, cache_umgehen=False, deadline=None):
+    """
+    Synchroner Wrapper um ki_wissensabruf_async für den Such-Thread der GUI.
+    """
+    return asyncio.run(ki_wissensabruf_async(anfrage, quelle_typ, stop_search_flag, cache_umgehen, deadline))
+
+
+async def ki_wissensabruf_async(anfrage, quelle_typ, stop_search_flag, cache_umgehen=False, deadline=None):
+    """
+    asyncio-Engine der Suche: Die Such-Pipeline und ein Abbruch-Wächter laufen in einer TaskGroup.
+    Wird stop_search_flag gesetzt, bricht der Wächter alle Stufen sofort ab.
+    deadline ist das Gesamt-Zeitbudget in Sekunden (None oder 0 = unbegrenzt).
+    """
+    ergebnis = ABBRUCH_TEXT
+    try:
+        async with asyncio.TaskGroup() as tg:
+            waechter = tg.create_task(_ueberwache_abbruch(stop_search_flag))
+            suche = tg.create_task(_suchpipeline_async(anfrage, quelle_typ, cache_umgehen, deadline))
+            ergebnis = await suche
+            waechter.cancel()
+    except* SucheAbgebrochen as gruppe:
+        # Alle Stufen sind jetzt abgebrochen; laufende Threads beenden sich über ihre Abbruch-Flags
+        dauer_ms = (time.monotonic() - gruppe.exceptions[0].erkannt) * 1000
+        print(f"INFO: Suche durch den Benutzer abgebrochen (Pipeline beendet {dauer_ms:.0f} ms nach Erkennung).")
+    return ergebnis
+
+
+async def _suchpipeline_async(anfrage, quelle_typ, cache_umgehen=False, deadline=None):
     """
     Führt eine Suche durch mit 1x DDGS und den anschließenden Quellenvergleich.
+    Ein frischer Cache-Eintrag wird vorher direkt zurückgegeben (außer bei cache_umgehen=True).
+    Das Zeitbudget (deadline) wird auf DDGS, Whitelist-Abruf und Übersetzung aufgeteilt.
     """
 
+    # 0. CACHE-ABFRAGE (vor dem ersten DDGS-Aufruf)
+    if not cache_umgehen:
+        cache_treffer = await _im_thread(get_cached_result, anfrage)
+        if cache_treffer:
+            ergebnis_text, timestamp = cache_treffer
+            print(f"INFO: Cache-Treffer für '{anfrage}' vom {timestamp} UTC. Websuche wird übersprungen.")
+            return f"{CACHE_PRAEFIX} {timestamp} UTC - Websuche übersprungen]\n\n{ergebnis_text}"
+
+    # 0b. LOKALER KORPUS (vorab gecrawlte Whitelist-Inhalte, ohne Netzwerkzugriff)
+    korpus_treffer = await _im_thread(suche_im_korpus, anfrage) if KORPUS_ENABLED or OFFLINE_MODE else []
+    if korpus_treffer:
+        print(f"INFO: {len(korpus_treffer)} Treffer im lokalen Korpus für '{anfrage}'. Websuche wird übersprungen.")
+        if OFFLINE_MODE:
+            for item in korpus_treffer:
+                item['text'] = item['text_original']
+        else:
+            await uebersetze_quellen_async(korpus_treffer, frist=Zeitbudget(deadline).anteil(DEADLINE_SHARE_TRANSLATION))
+        combined_content, source_info = summarize_multiple_sources(korpus_treffer, anfrage)
+        return f"Erkenntnis-Simulation (Quelle: {quelle_typ}, Dienst: Lokaler Korpus):\n\n" \
+               f"--- VERGLEICHENDE ZUSAMMENFASSUNG (KI-Analyse):\n\n**{combined_content}**\n\n" + source_info
+    if OFFLINE_MODE:
+        return f"Keine Online-Dokumente abgerufen: Offline-Modus aktiv und kein Treffer für '{anfrage}' im lokalen Korpus ({KORPUS_DB_NAME})."
+
     quelle_typ = "Allgemeine Suche"
     domain_ausschlusse = " ".join([f"-site:{d}" for d in UNRELIABLE_DOMAINS if d not in ('youtube.com')])
     suchanfrage_effektiv = f"{anfrage} language:de {domain_ausschlusse}"
@@ -331,105 +2265,82 @@ def ki_wissensabruf_und_vergleich(anfrage, quelle_typ, stop_search_flag):
     irrelevant_keywords = {'flüge', 'airfare', 'cheap', 'reisen', 'travel', 'flights', 'points'}
 
     error_log_full = []
+    zeitbudget = Zeitbudget(deadline)
+    teilergebnis = False # True, wenn eine Stufe wegen des Zeitbudgets vorzeitig beendet wurde
+    hedge_budget = HedgeBudget()
     successful_content = None
     successful_result = None
+    quelle_gekuerzt = False
     dienst_name = ""
     results = []
     quelle_zusatz = ""
 
     # 1. DDGS SUCH-STRATEGIEN (MAX_RETRIES)
-    for retry_count in range(MAX_RETRIES):
-        if stop_search_flag.is_set():
-            return "Suche durch den Benutzer abgebrochen.", "Abbruch"
-
-        effective_proxy_pool = [p for p in PROXY_POOL if p is not None]
-        if effective_proxy_pool and random.random() < 0.75:
-            current_proxy = random.choice(effective_proxy_pool)
-        else:
-            current_proxy = None
-
-        zufaellige_pause = random.uniform(5, 10)
-        print(f"INFO: {dienst_name_current} Versuch ({retry_count + 1}). Warte {zufaellige_pause:.2f}s mit Proxy: {current_proxy if current_proxy else 'Kein Proxy'}")
-        time.sleep(zufaellige_pause)
-
-        try:
-            with DDGS(timeout=20, proxy=current_proxy) as ddgs:
-                results = list(ddgs.text(suchanfrage_effektiv, max_results=8))
-
-            if not results: continue
-            error_log_retry = []
-
-            for i, result in enumerate(results):
-                if stop_search_flag.is_set(): return "Suche durch den Benutzer abgebrochen.", "Abbruch"
-                first_url = result.get('href')
-                first_title = result.get('title', '').lower()
-
-                if not first_url or any(domain in first_url for domain in UNRELIABLE_DOMAINS) or any(kw in first_title for kw in irrelevant_keywords):
-                    error_log_retry.append(f"Quelle #{i+1} ({first_url}): Ignoriert (Blacklist/Irrelevant).")
-                    continue
-
-                print(f"INFO: Versuche, Quelle #{i+1} zu laden: {first_url}")
-                inhalt, success = get_text_from_url(first_url, current_proxy)
-
-                if success:
-                    successful_result = result
-                    successful_content = inhalt
-                    dienst_name = dienst_name_current
-                    break
-                else:
-                    error_log_retry.append(f"Quelle #{i+1} ({first_url}): {inhalt}")
-
-            error_log_full.extend(error_log_retry)
-            if successful_result and successful_content: break
-
-        except Exception as e:
-            error_log_full.append(f"Suchdienst {dienst_name_current} ist fehlgeschlagen: {type(e).__name__} (Möglicherweise IP-Blockade!)")
+    # Die DDGS-Versuche erhalten einen Anteil des Zeitbudgets; danach folgt der Whitelist-Fallback
+    try:
+        async with asyncio.timeout(zeitbudget.anteil(DEADLINE_SHARE_DDGS)):
+            for retry_count in range(MAX_RETRIES):
+                current_proxy = proxy_manager.waehle()
+
+                # Adaptiver Token-Bucket statt fester Pause: ein ausgeruhter Bucket erlaubt den Aufruf sofort
+                wartezeit = await _im_thread(ddgs_limiter.reserviere)
+                print(f"INFO: {dienst_name_current} Versuch ({retry_count + 1}). Warte {wartezeit:.2f}s mit Proxy: {current_proxy if current_proxy else 'Kein Proxy'}")
+                await asyncio.sleep(wartezeit)
+
+                try:
+                    results = await _im_thread(_ddgs_text, suchanfrage_effektiv, current_proxy, 8, zeitbudget.timeout(20))
+
+                    if not results: continue
+                    error_log_retry = []
+                    kandidaten = []
+
+                    for i, result in enumerate(results):
+                        first_url = result.get('href')
+                        first_title = result.get('title', '').lower()
+
+                        if not first_url or any(domain in first_url for domain in UNRELIABLE_DOMAINS) or any(kw in first_title for kw in irrelevant_keywords):
+                            error_log_retry.append(f"Quelle #{i+1} ({first_url}): Ignoriert (Blacklist/Irrelevant).")
+                            continue
+                        if host_health.ist_gesperrt(first_url):
+                            error_log_retry.append(f"Quelle #{i+1} ({first_url}): Ignoriert (Host vorübergehend gesperrt).")
+                            continue
+                        negativ = url_negativ_cache.pruefe(first_url)
+                        if negativ:
+                            error_log_retry.append(f"Quelle #{i+1} ({first_url}): Ignoriert (kürzlich fehlgeschlagen: {negativ[0]}, {negativ[1]}).")
+                            continue
+                        kandidaten.append((i, result))
+
+                    print(f"INFO: Lade {len(kandidaten)} Quellen mit bis zu {PARALLEL_CANDIDATE_FETCHES} parallelen Abrufen.")
+                    gewinner, fehler_log = await lade_kandidaten_async(kandidaten, current_proxy, hedge_budget=hedge_budget, zeitbudget=zeitbudget)
+                    error_log_retry.extend(fehler_log)
+
+                    if gewinner:
+                        i, successful_result, successful_content, quelle_info = gewinner
+                        quelle_gekuerzt = quelle_info.get('gekuerzt', False)
+                        dienst_name = dienst_name_current
+                        print(f"INFO: Quelle #{i+1} erfolgreich geladen: {successful_result.get('href')}")
+
+                    error_log_full.extend(error_log_retry)
+                    if successful_result and successful_content: break
+
+                except Exception as e:
+                    error_log_full.append(f"Suchdienst {dienst_name_current} ist fehlgeschlagen: {type(e).__name__} (Möglicherweise IP-Blockade!)")
+    except TimeoutError:
+        error_log_full.append(f"Suchdienst {dienst_name_current}: Zeitanteil des Budgets aufgebraucht, weiter mit dem Whitelist-Fallback.")
 
 
     # 2. WHITELIST FALLBACK MIT QUELLENVERGLEICH
     whitelist_results = []
     if not successful_content:
-        print("INFO: DDGS-Suche fehlgeschlagen. Starte Whitelist-Fallback mit Quellenvergleich.")
-        suchstring_query = anfrage.replace(" ", "+")
-        effective_proxy_pool = [p for p in PROXY_POOL if p is not None]
-
-        for base_url in RELIABLE_URL_WHITELIST:
-            if stop_search_flag.is_set(): return "Suche durch den Benutzer abgebrochen.", "Abbruch"
-
-            current_proxy = random.choice(effective_proxy_pool) if effective_proxy_pool and random.random() < 0.75 else None
-
-            # URL-Erstellung (unverändert)
-            final_url = ""
-            domain_name = base_url.split('/')[2]
-            if "wikipedia.org/" in base_url and "/wiki/" not in base_url:
-                final_url = f"{base_url}w/index.php?search={suchstring_query}"
-            elif "spektrum.de/lexikon" in base_url:
-                final_url = f"{base_url}{suchstring_query}"
-            elif "docs.python.org/3/" in base_url:
-                final_url = f"{base_url}search.html?q={suchstring_query}"
-            elif domain_name in ["www.nasa.gov", "www.nih.gov", "www.epa.gov", "www.eia.gov", "www.usgs.gov", "www.nature.com", "www.sciencemag.org", "www.science.org"]:
-                final_url = f"{base_url}search?q={suchstring_query}"
-            elif domain_name == "www.sciencedirect.com":
-                final_url = f"{base_url}search?qs={suchstring_query}"
-            else:
-                final_url = f"{base_url}suche?q={suchstring_query}"
-
-            print(f"INFO: Versuche, Whitelist-Quelle zu laden: {final_url}")
-            time.sleep(random.uniform(1.0, 2.5))
-            inhalt, success = get_text_from_url(final_url, current_proxy)
-
-            if success:
-                whitelist_results.append({
-                    'title': f"Whitelist: {base_url.split('/')[2]}",
-                    'href': final_url,
-                    'text_original': inhalt
-                })
+        print(f"INFO: DDGS-Suche fehlgeschlagen. Starte Whitelist-Fallback mit Quellenvergleich ({WHITELIST_MAX_CONNECTIONS} parallele Abrufe).")
+        whitelist_results, komplett = await lade_whitelist_quellen_async(anfrage, hedge_budget=hedge_budget, zeitbudget=zeitbudget,
+                                                                         frist=zeitbudget.anteil(DEADLINE_SHARE_WHITELIST))
+        teilergebnis = teilergebnis or not komplett
 
         if whitelist_results:
             dienst_name = "Whitelist-Quellenvergleich"
-            for item in whitelist_results:
-                if stop_search_flag.is_set(): return "Suche durch den Benutzer abgebrochen.", "Abbruch"
-                item['text'] = translate_to_german(item['text_original'])
+            komplett = await uebersetze_quellen_async(whitelist_results, frist=zeitbudget.anteil(DEADLINE_SHARE_TRANSLATION))
+            teilergebnis = teilergebnis or not komplett
 
             combined_content, source_info = summarize_multiple_sources(whitelist_results, anfrage)
             successful_result = {'title': 'Mehrere Whitelist-Quellen', 'href': 'Zusammenfassung'}
@@ -444,7 +2355,13 @@ def ki_wissensabruf_und_vergleich(anfrage, quelle_typ, stop_search_flag):
         erkenntnis = f"Erkenntnis-Simulation (Quelle: {quelle_typ}, Dienst: {dienst_name}):\n\n"
 
         if dienst_name != "Whitelist-Quellenvergleich":
-            uebersetzter_inhalt = translate_to_german(successful_content)
+            try:
+                uebersetzter_inhalt = await asyncio.wait_for(_im_thread_abbrechbar(translate_to_german, successful_content),
+                                                             zeitbudget.anteil(DEADLINE_SHARE_TRANSLATION))
+            except TimeoutError:
+                teilergebnis = True
+                uebersetzter_inhalt = "[Übersetzungsfehler: Zeitbudget der Suche aufgebraucht.]"
+
             if uebersetzter_inhalt.startswith("[Übersetzungsfehler:"):
                 erkenntnis += "[INFO: Übersetzung fehlgeschlagen. Originaltext wird verwendet.]\n"
                 display_text = successful_content
@@ -459,7 +2376,10 @@ def ki_wissensabruf_und_vergleich(anfrage, quelle_typ, stop_search_flag):
             erkenntnis += f"**{display_text.strip()}**\n\n"
             erkenntnis += f"--- QUELLE DER ERKENNTNIS:\n"
             erkenntnis += f"Titel: {successful_result.get('title', 'Kein Titel')} \n"
-            erkenntnis += f"URL: {successful_result.get('href')}\n\n"
+            erkenntnis += f"URL: {successful_result.get('href')}\n"
+            if quelle_gekuerzt:
+                erkenntnis += "Hinweis: Seite nur teilweise geladen (Download-Budget erreicht).\n"
+            erkenntnis += "\n"
 
             if results:
                 erkenntnis += "Weitere gefundene Quellen (ungeladen oder blockiert):\n"
@@ -471,13 +2391,17 @@ def ki_wissensabruf_und_vergleich(anfrage, quelle_typ, stop_search_flag):
             erkenntnis += f"**{successful_content}**\n\n"
             erkenntnis += quelle_zusatz
 
-        save_to_db(anfrage, dienst_name, erkenntnis)
+        # Teilergebnisse werden nicht gecacht, damit eine spätere Suche das vollständige Ergebnis liefert
+        if teilergebnis:
+            erkenntnis = f"{TEILERGEBNIS_PRAEFIX} {deadline:.0f}s erreicht. Das Ergebnis beruht auf den bis dahin geladenen Quellen.]\n" + erkenntnis
+        else:
+            await _im_thread(save_to_db, anfrage, dienst_name, erkenntnis)
         return erkenntnis
 
     # --- 4. FINALER FEHLER NACH WHITELIST + FUZZY-MATCHING ---
 
     error_summary = "\n".join(error_log_full)
-    similar_queries = get_similar_cached_queries(anfrage)
+    similar_queries = await _im_thread(get_similar_cached_queries, anfrage)
 
     ip_hint = "\n\n*** WICHTIGER HINWEIS: ***\nDie Proxys wurden in den Code integriert. Wenn Fehler weiterhin auftreten, sind die kostenlosen Proxys wahrscheinlich bereits überlastet oder blockiert. Sie müssen dann **neue Proxys** in der Liste 'PROXY_POOL' eintragen."
 
@@ -485,6 +2409,7 @@ def ki_wissensabruf_und_vergleich(anfrage, quelle_typ, stop_search_flag):
         error_output = "Suche wurde erfolgreich durch den Benutzer abgebrochen."
     else:
         error_output = f"Keine Online-Dokumente extrahiert nach {MAX_RETRIES} DDGS-Versuchen UND dem Whitelist-Fallback (Quellenvergleich). \n\n" \
+                       + (f"(Zeitbudget von {deadline:.0f}s aufgebraucht.)\n\n" if zeitbudget.abgelaufen() else "") + \
                        f"(Alle Quellen wurden blockiert, lieferten keinen substanziellen Text oder wurden als irrelevant/zu kurz übersprungen. Mindestlänge: {MIN_TEXT_LENGTH} Zeichen.)\n\n" \
                        f"Fehler-Details (kumuliert):\n{error_summary}\n" + ip_hint + "\n\n"
 
@@ -620,11 +2545,23 @@ class WissensKI_GUI:
         self.current_anfrage = ""
         self.stop_search_flag = threading.Event()
         self.search_running = False
+        self.abbruch_zeitpunkt = None # time.monotonic() des Abbruch-Klicks, zur Messung der Abbruch-Latenz
 
         if not initialize_db():
             messagebox.showerror("Datenbankfehler", "Konnte die SQLite-Datenbank nicht initialisieren. Programm wird beendet.")
             master.quit()
             return
+        # Lokaler Korpus ist optional: bei Fehlern wird er nur deaktiviert, das Programm startet trotzdem
+        initialize_korpus_db()
+
+        # Proxys im Hintergrund prüfen (Latenz, Erfolgsquote, Aussortieren toter Proxys)
+        if OFFLINE_MODE:
+            master.title("Wissens-KI (Prototyp mit Anti-Block-Logik) - Offline-Modus")
+        else:
+            proxy_manager.starte_probing()
+            # Verbindungen zu Whitelist-Hosts aufbauen, während der Benutzer noch tippt
+            if PREWARM_ENABLED:
+                starte_vorwaermen()
 
         master.attributes('-fullscreen', True)
         master.bind('<Escape>', lambda e: master.attributes('-fullscreen', False))
@@ -682,6 +2619,19 @@ class WissensKI_GUI:
         self.speichern_button.grid(row=0, column=3, padx=5, sticky=(tk.W, tk.E))
         Tooltip(self.speichern_button, "Speichert das aktuell angezeigte Ergebnis manuell in der Datenbank.")
 
+        self.cache_umgehen_var = tk.BooleanVar(value=False)
+        self.cache_umgehen_check = ttk.Checkbutton(button_frame, text="Cache umgehen", variable=self.cache_umgehen_var)
+        self.cache_umgehen_check.grid(row=1, column=0, padx=5, pady=(5, 0), sticky=tk.W)
+        Tooltip(self.cache_umgehen_check, f"Ignoriert gespeicherte Ergebnisse (jünger als {CACHE_MAX_AGE_HOURS}h) und sucht erneut im Web.")
+
+        deadline_frame = ttk.Frame(button_frame)
+        deadline_frame.grid(row=1, column=1, padx=5, pady=(5, 0), sticky=tk.W)
+        ttk.Label(deadline_frame, text="Zeitlimit (s):").pack(side=tk.LEFT)
+        self.deadline_var = tk.StringVar(value=str(SEARCH_DEADLINE_DEFAULT))
+        self.deadline_spinbox = ttk.Spinbox(deadline_frame, from_=0, to=900, increment=15, width=5, textvariable=self.deadline_var)
+        self.deadline_spinbox.pack(side=tk.LEFT, padx=(5, 0))
+        Tooltip(self.deadline_spinbox, "Gesamtes Zeitbudget der Suche. Danach wird das beste Teilergebnis angezeigt (0 = unbegrenzt).")
+
 
         # 3. Ausgabe-Bereich
         ttk.Label(main_frame, text="KI-Erkenntnis:", font=('Arial', 14, 'bold')).grid(row=4, column=0, columnspan=2, sticky=tk.W, pady=(15, 5))
@@ -704,18 +2654,19 @@ class WissensKI_GUI:
 
     def speichere_ergebnis(self):
         """Speichert das aktuelle Ergebnis manuell in die Datenbank."""
-        if self.current_result_text and not self.current_result_text.startswith("Keine Online-Dokumente"):
+        if self.current_result_text and not self.current_result_text.startswith(NICHT_SPEICHERBAR_PRAEFIXE):
             success = save_to_db(self.current_anfrage, "Manuell gespeichert", self.current_result_text)
             if success:
                 messagebox.showinfo("Speichern Erfolgreich", "Das aktuelle Ergebnis wurde erfolgreich im Cache gespeichert.")
             else:
                 messagebox.showerror("Speichern Fehlgeschlagen", "Fehler beim Speichern in die Datenbank.")
         else:
-            messagebox.showwarning("Kein Ergebnis", "Es kann kein leeres oder fehlerhaftes Ergebnis gespeichert werden.")
+            messagebox.showwarning("Kein Ergebnis", "Leere, fehlerhafte, bereits gecachte oder unvollständige Ergebnisse werden nicht gespeichert.")
 
     def brich_suche_ab(self, event=None):
         """Setzt das Flag, um den laufenden Such-Thread zu beenden."""
         if self.search_running:
+            self.abbruch_zeitpunkt = time.monotonic()
             self.stop_search_flag.set()
             self.abbrechen_button.config(state='disabled')
 
@@ -734,6 +2685,7 @@ class WissensKI_GUI:
 
         self.current_anfrage = anfrage
         self.search_running = True
+        self.abbruch_zeitpunkt = None
         self.stop_search_flag.clear()
 
         # GUI-Elemente aktualisieren
@@ -747,11 +2699,16 @@ class WissensKI_GUI:
         self.ausgabe_text.insert(tk.END, f"Suche, analysiere, **übersetze** und speichere... (2 DDGS-Versuche, dann **robuster Whitelist-Vergleich** mit verbesserter Anti-Detection-Logik. Max. {MAX_CHARS} Zeichen).")
         self.ausgabe_text.config(state='disabled')
 
-        threading.Thread(target=self.fuehre_suche_aus, args=(anfrage, "Allgemeine Suche", self.stop_search_flag,), daemon=True).start()
+        try:
+            deadline = max(0.0, float(self.deadline_var.get()))
+        except ValueError:
+            deadline = SEARCH_DEADLINE_DEFAULT
+
+        threading.Thread(target=self.fuehre_suche_aus, args=(anfrage, "Allgemeine Suche", self.stop_search_flag, self.cache_umgehen_var.get(), deadline), daemon=True).start()
 
-    def fuehre_suche_aus(self, anfrage, quelle, stop_search_flag):
+    def fuehre_suche_aus(self, anfrage, quelle, stop_search_flag, cache_umgehen=False, deadline=None):
         """Ruft die Backend-Logik auf."""
-        ergebnis = ki_wissensabruf_und_vergleich(anfrage, quelle, stop_search_flag)
+        ergebnis = ki_wissensabruf_und_vergleich(anfrage, quelle, stop_search_flag, cache_umgehen, deadline)
         self.master.after(0, self.aktualisiere_ausgabe, ergebnis, anfrage)
 
     def aktualisiere_ausgabe(self, ergebnis, anfrage):
@@ -759,6 +2716,11 @@ class WissensKI_GUI:
         self.current_result_text = ergebnis
         self.search_running = False
 
+        if self.abbruch_zeitpunkt is not None and ergebnis == ABBRUCH_TEXT:
+            abbruch_latenz = time.monotonic() - self.abbruch_zeitpunkt
+            print(f"INFO: Abbruch-Latenz (Klick bis Anzeige): {abbruch_latenz * 1000:.0f} ms")
+            ergebnis += f"\n(Abbruch nach {abbruch_latenz:.2f}s wirksam.)"
+
         self.ausgabe_text.config(state='normal')
         self.ausgabe_text.delete(1.0, tk.END)
         self.ausgabe_text.insert(tk.END, ergebnis)
@@ -769,7 +2731,7 @@ class WissensKI_GUI:
         self.abbrechen_button.config(state='disabled')
         self.verlauf_button.config(state='normal')
 
-        if not ergebnis.startswith("Keine Online-Dokumente") and not ergebnis.startswith("Suche wurde"):
+        if not ergebnis.startswith(NICHT_SPEICHERBAR_PRAEFIXE):
             self.speichern_button.config(state='normal')
         else:
             self.speichern_button.config(state='disabled')
@@ -778,6 +2740,19 @@ class WissensKI_GUI:
 ## 🚀 ANWENDUNG STARTEN
 
 if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Wissens-KI")
+    parser.add_argument("--crawl", action="store_true", help="Whitelist-Quellen in den lokalen Korpus crawlen und beenden")
+    parser.add_argument("--offline", action="store_true", help="Strikter Offline-Modus: nur Cache und lokaler Korpus")
+    parser.add_argument("--parser", choices=PARSER_PRIORITAET, help="HTML-Parser-Backend erzwingen (Standard: schnellstes installiertes)")
+    args = parser.parse_args()
+    print(f"INFO: HTML-Parser-Backend: {waehle_parser(args.parser)} (installiert: {', '.join(verfuegbare_parser())})")
+
+    if args.crawl:
+        initialize_db()
+        print(f"INFO: Crawl abgeschlossen, {crawle_korpus()} Seiten im Korpus {KORPUS_DB_NAME}.")
+        sys.exit(0)
+    OFFLINE_MODE = args.offline
+
     root = tk.Tk()
     app = WissensKI_GUI(root)
     root.mainloop()
\ No newline at end of file
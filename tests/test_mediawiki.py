@@ -0,0 +1,126 @@
+"""
+Tests für den MediaWiki-Schnellweg (get_text_from_mediawiki) gegen einen lokalen Stub-Server.
+Der Stub beantwortet die Such-API wie MediaWiki mit formatversion=2; das Verhalten steuert der Suchbegriff.
+"""
+import asyncio
+import http.server
+import importlib.util
+import json
+import os
+import tempfile
+import threading
+import unittest
+from unittest import mock
+from urllib.parse import urlparse, parse_qs
+
+MODUL_PFAD = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "KI.M8.py")
+
+def lade_modul():
+    spec = importlib.util.spec_from_file_location("ki_m8", MODUL_PFAD)
+    modul = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(modul)
+    return modul
+
+ki = lade_modul()
+
+LANGER_EXTRAKT = "Python ist eine universelle, üblicherweise interpretierte höhere Programmiersprache. " * 5
+
+
+class MediaWikiStub(http.server.BaseHTTPRequestHandler):
+    """
+    Minimaler Ersatz für /w/api.php. gsrsearch bestimmt die Antwort:
+    'treffer' -> Artikel mit Extrakt, 'leer' -> keine Seiten, 'kurz' -> zu kurzer Extrakt, 'fehler' -> HTTP 500.
+    """
+    anfragen = [] # Query-Parameter aller Anfragen (zur Prüfung von formatversion usw.)
+
+    def log_message(self, *args):
+        pass
+
+    def do_GET(self):
+        params = {k: v[0] for k, v in parse_qs(urlparse(self.path).query).items()}
+        self.anfragen.append(params)
+        suche = params.get('gsrsearch', '')
+        if suche == 'fehler':
+            self.send_error(500)
+            return
+        if suche == 'leer':
+            antwort = {'batchcomplete': True}
+        else:
+            extrakt = LANGER_EXTRAKT if suche == 'treffer' else "Zu kurz."
+            antwort = {'batchcomplete': True, 'query': {'pages': [{
+                'pageid': 1, 'ns': 0, 'title': 'Python (Programmiersprache)',
+                'fullurl': 'https://de.wikipedia.org/wiki/Python_(Programmiersprache)',
+                'extract': extrakt,
+            }]}}
+        daten = json.dumps(antwort).encode('utf-8')
+        self.send_response(200)
+        self.send_header('Content-Type', 'application/json; charset=utf-8')
+        self.send_header('Content-Length', str(len(daten)))
+        self.end_headers()
+        self.wfile.write(daten)
+
+
+class MediaWikiTest(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.server = http.server.ThreadingHTTPServer(('127.0.0.1', 0), MediaWikiStub)
+        threading.Thread(target=cls.server.serve_forever, daemon=True).start()
+        cls.api_url = f"http://127.0.0.1:{cls.server.server_address[1]}/w/api.php"
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.server.shutdown()
+        cls.server.server_close()
+
+    def setUp(self):
+        MediaWikiStub.anfragen.clear()
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        db_name = os.path.join(tmp.name, "test.db")
+        # Eigene Datenbank und Zustände, nur Direktverbindung, keine Höflichkeitspausen zwischen den Anfragen an den Stub
+        for name, wert in (('DB_NAME', db_name),
+                           ('host_health', ki.HostHealthTracker(db_name)),
+                           ('proxy_manager', ki.ProxyManager(proxies=[None])),
+                           ('_host_scheduler', ki.HostPolitenessScheduler(min_intervall=0, jitter=0))):
+            patcher = mock.patch.object(ki, name, wert)
+            patcher.start()
+            self.addCleanup(patcher.stop)
+        ki.initialize_db()
+
+    def test_treffer(self):
+        text, success, artikel_url = ki.get_text_from_mediawiki(self.api_url, "treffer", timeout=5)
+        self.assertTrue(success)
+        self.assertTrue(text.startswith("Python ist eine universelle"))
+        self.assertEqual(artikel_url, 'https://de.wikipedia.org/wiki/Python_(Programmiersprache)')
+        self.assertEqual(MediaWikiStub.anfragen[0]['formatversion'], '2')
+        self.assertEqual(MediaWikiStub.anfragen[0]['generator'], 'search')
+
+    def test_keine_seiten(self):
+        text, success, artikel_url = ki.get_text_from_mediawiki(self.api_url, "leer", timeout=5)
+        self.assertFalse(success)
+        self.assertIn("Kein passender Artikel", text)
+        self.assertEqual(artikel_url, self.api_url)
+
+    def test_zu_kurzer_extrakt(self):
+        text, success, artikel_url = ki.get_text_from_mediawiki(self.api_url, "kurz", timeout=5)
+        self.assertFalse(success)
+        self.assertIn("keinen substanziellen Text", text)
+
+    def test_http_fehler(self):
+        text, success, artikel_url = ki.get_text_from_mediawiki(self.api_url, "fehler", timeout=5)
+        self.assertFalse(success)
+        self.assertIn("Code: 500", text)
+
+    def test_whitelist_nutzt_konfigurierten_endpunkt(self):
+        base_url = "https://de.wikipedia.org/"
+        with mock.patch.object(ki, 'MEDIAWIKI_API_ENDPOINTS', {base_url: self.api_url}), \
+             mock.patch.object(ki, 'RELIABLE_URL_WHITELIST', [base_url]):
+            quellen, komplett = asyncio.run(ki.lade_whitelist_quellen_async("treffer"))
+        self.assertTrue(komplett)
+        self.assertEqual(len(quellen), 1)
+        self.assertEqual(quellen[0]['href'], 'https://de.wikipedia.org/wiki/Python_(Programmiersprache)')
+        self.assertEqual(len(MediaWikiStub.anfragen), 1)
+
+
+if __name__ == '__main__':
+    unittest.main()